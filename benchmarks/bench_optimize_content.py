@@ -0,0 +1,117 @@
+"""
+Benchmark ArticleCurator.optimize_content_for_llm against the original implementation.
+
+Uses the text of every archived newsletter page (archive/*.html, docs/index.html) as
+scraped-article input, checks both implementations produce identical output, and
+reports per-call timings.
+
+Run from the repository root:
+    python benchmarks/bench_optimize_content.py [--repeat N] [--scale K]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from src.mvp_news_aggregator.article_extractor import ArticleExtractor
+from src.mvp_news_aggregator.curator import ArticleCurator
+
+
+def original_optimize_content_for_llm(raw_content: str, url: str) -> str:
+    """Reference copy of the pre-optimisation implementation (debug output removed)"""
+    junk_patterns = [
+        r'subscribe\s+to\s+our\s+newsletter',
+        r'follow\s+us\s+on\s+social\s+media',
+        r'advertisement\s*:?',
+        r'related\s+articles?:?',
+        r'more\s+from\s+\w+:?',
+        r'read\s+more\s+about',
+        r'sign\s+up\s+for',
+        r'cookies?\s+policy',
+        r'terms\s+of\s+service',
+        r'privacy\s+policy',
+        r'share\s+this\s+article',
+        r'\bshare\b.*\bfacebook\b.*\btwitter\b',
+        r'loading\.\.\.?',
+    ]
+
+    cleaned = raw_content
+    removed_patterns = []
+
+    for pattern in junk_patterns:
+        matches = re.findall(pattern, cleaned, flags=re.IGNORECASE)
+        if matches:
+            removed_patterns.extend(matches)
+            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+
+    cleaned = ' '.join(cleaned.split())
+    sentences = [s.strip() + '.' for s in cleaned.split('.') if len(s.strip()) > 20]
+    return ' '.join(sentences[:8])
+
+
+def load_inputs(scale: int):
+    """Extract the text of each archived page, optionally repeated to simulate longer articles"""
+    extractor = ArticleExtractor(selectors=['body'], min_content_chars=0)
+    inputs = []
+    for path in sorted(glob.glob('archive/*.html')) + ['docs/index.html']:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            text = extractor.extract_from_html(f.read())['text'] or ''
+        inputs.append((path, ' '.join([text] * scale)))
+    return inputs
+
+
+def time_calls(func, inputs, repeat: int) -> float:
+    """Best-of-`repeat` total seconds to process all inputs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path, text in inputs:
+            func(text, path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions (best is reported)')
+    parser.add_argument('--scale', type=int, default=1, help='repeat each page text K times')
+    args = parser.parse_args()
+
+    inputs = load_inputs(args.scale)
+    if not inputs:
+        print("No archived pages found - run from the repository root")
+        return
+
+    curator = ArticleCurator(use_llm=False, use_content_cache=False)
+
+    def new_impl(text, url):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return curator.optimize_content_for_llm(text, url)
+
+    mismatches = [path for path, text in inputs
+                  if new_impl(text, path) != original_optimize_content_for_llm(text, path)]
+
+    total_chars = sum(len(text) for _, text in inputs)
+    old_s = time_calls(original_optimize_content_for_llm, inputs, args.repeat)
+    new_s = time_calls(new_impl, inputs, args.repeat)
+
+    print(f"Inputs: {len(inputs)} pages, {total_chars:,} chars (scale x{args.scale})")
+    print(f"Original:  {old_s * 1000:8.2f} ms total, {old_s / len(inputs) * 1e6:8.1f} us/page")
+    print(f"Optimized: {new_s * 1000:8.2f} ms total, {new_s / len(inputs) * 1e6:8.1f} us/page")
+    print(f"Speedup:   {old_s / new_s:.1f}x")
+    print(f"Output identical on {len(inputs) - len(mismatches)}/{len(inputs)} pages")
+    for path in mismatches:
+        print(f"  differs: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark the full run_daily_pipeline path offline, at 1x/10x/100x feed volume.
+
+Feeds, article pages and FX/yfinance payloads are served from
+benchmarks/offline_fixtures.py and every LLM call goes to the fake backend in
+llm_backends.py (with optional latency, 429 and malformed-output injection), so a
+run makes no network calls and needs no API keys. Each scale runs in a fresh temporary working directory (empty caches and
+article store) and reports per-stage wall time and peak Python memory, taken from
+the pipeline's own tracing spans. tracemalloc slows the pipeline several times
+over, so memory is measured in a second run and the times come from the first.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline_offline.py [--scales 1 10 100] [--llm-latency lognormal:0.8:0.5] [--llm-429-rate 0.05] [--json out.json]
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src', 'mvp_news_aggregator'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from offline_fixtures import OfflineFixtures, offline_pipeline, FX_FILE, MARKET_FILE
+from src.mvp_news_aggregator.tracing import start_trace, stop_trace
+
+# Stage spans opened by main._run_daily_pipeline, then the curator's steps within 'curate'
+STAGES = ['collect', 'curate', 'quiz', 'fx', 'market', 'generate']
+CURATE_STEPS = ['time_filter', 'basic_filter', 'deduplicate', 'llm_curate', 'scrape_and_enhance']
+
+
+def prepare_workdir(workdir: str):
+    """Seed data/loading with the instrument lists only, so every price and rate is fetched"""
+    loading = os.path.join(workdir, 'data', 'loading')
+    os.makedirs(loading)
+    for path, history_key in ((MARKET_FILE, 'daily_prices'), (FX_FILE, 'daily_rates')):
+        with open(os.path.join(REPO_ROOT, path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data[history_key] = {}
+        with open(os.path.join(workdir, path), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def stage_stats(trace: dict) -> dict:
+    """{span name: (seconds, peak KB)} for the stage spans and curation steps"""
+    stats = {}
+    for event in trace['traceEvents']:
+        if event.get('ph') != 'X':
+            continue
+        if (event['cat'] == 'stage' and event['name'] in STAGES) or (event['cat'] == 'curation' and event['name'] in CURATE_STEPS):
+            stats[event['name']] = (event['dur'] / 1e6, event['args'].get('mem_peak_kb'))
+    return stats
+
+
+def llm_stats(trace: dict) -> dict:
+    """Model calls that reached the backend, and how many of them were rate limited"""
+    calls = [event for event in trace['traceEvents']
+             if event.get('ph') == 'X' and event['cat'] == 'llm' and not event['args'].get('cached')]
+    return {'calls': len(calls),
+            'rate_limited': sum('ResourceExhausted' in event['args'].get('error', '') for event in calls)}
+
+
+def run_scale(scale: int, args, track_memory: bool) -> dict:
+    import main
+    from curator import ArticleCurator
+
+    fixtures = OfflineFixtures(REPO_ROOT, scale=scale)
+    feeds = sum(len(sources) for sources in fixtures.sources.values())
+    workdir = tempfile.mkdtemp(prefix=f'bench_pipeline_{scale}x_')
+    original_feeds, original_curator = main.RSS_FEEDS, main.ArticleCurator
+    try:
+        prepare_workdir(workdir)
+        os.chdir(workdir)
+        # Synthetic hosts need no politeness delay, and the fake model no rate limit
+        main.RSS_FEEDS = fixtures.sources
+        main.ArticleCurator = functools.partial(ArticleCurator, llm_requests_per_minute=args.llm_rpm,
+                                                scrape_host_interval=args.host_interval)
+
+        log = sys.stderr if args.verbose else io.StringIO()
+        llm_settings = {'FAKE_LLM_LATENCY': args.llm_latency, 'FAKE_LLM_429_RATE': str(args.llm_429_rate),
+                        'FAKE_LLM_MALFORMED_RATE': str(args.llm_malformed_rate), 'FAKE_LLM_SEED': str(args.llm_seed)}
+        with offline_pipeline(fixtures, args.http_latency, llm_settings) as transport:
+            start_trace(track_memory=track_memory)
+            started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(log):
+                    main.run_daily_pipeline(use_llm=True, send_email=False, trace=False)
+            except Exception:
+                if not args.verbose:
+                    print(log.getvalue()[-5000:], file=sys.stderr)
+                raise
+            finally:
+                total = time.perf_counter() - started
+                trace_path = stop_trace(os.path.join(workdir, 'trace.json'))
+
+        with open(trace_path, 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+        stats, llm = stage_stats(trace), llm_stats(trace)
+        if args.keep_traces:
+            kept = os.path.join(REPO_ROOT, 'data', 'traces', f'bench_offline_{scale}x.json')
+            os.makedirs(os.path.dirname(kept), exist_ok=True)
+            shutil.copyfile(trace_path, kept)
+    finally:
+        os.chdir(REPO_ROOT)
+        main.RSS_FEEDS, main.ArticleCurator = original_feeds, original_curator
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'scale': scale, 'feeds': feeds, 'items': len(fixtures.pages), 'total_s': round(total, 3),
+        'http_requests': transport.requests, 'bytes_served': transport.bytes_served, 'llm': llm,
+        'stages': {name: {'seconds': round(seconds, 3), 'peak_kb': peak} for name, (seconds, peak) in stats.items()},
+    }
+
+
+def run_isolated(scale: int, args, track_memory: bool) -> dict:
+    """run_scale() in a fresh interpreter, so one scale's memory (or an OOM kill) can't affect another"""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as out:
+        out_path = out.name
+    command = [sys.executable, os.path.abspath(__file__), '--child-scale', str(scale), '--child-out', out_path,
+               '--http-latency', str(args.http_latency), '--llm-latency', args.llm_latency,
+               '--llm-429-rate', str(args.llm_429_rate), '--llm-malformed-rate', str(args.llm_malformed_rate),
+               '--llm-seed', str(args.llm_seed),
+               '--llm-rpm', str(args.llm_rpm), '--host-interval', str(args.host_interval)]
+    command += ['--child-memory'] * track_memory + ['--keep-traces'] * args.keep_traces + ['--verbose'] * args.verbose
+    try:
+        completed = subprocess.run(command, cwd=REPO_ROOT)
+        if completed.returncode != 0:
+            reason = 'killed - out of memory?' if completed.returncode == -9 else f"exit code {completed.returncode}"
+            return {'scale': scale, 'error': reason}
+        with open(out_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(out_path)
+
+
+def print_report(results: list, memory: bool):
+    completed = [r for r in results if 'error' not in r]
+    for r in results:
+        if 'error' in r:
+            print(f"\n{r['scale']}x failed: {r['error']}")
+    if not completed:
+        return
+    results = completed
+    names = [name for name in STAGES + CURATE_STEPS if any(name in r['stages'] for r in results)]
+    width = max(len(name) for name in names) + 2
+    header = ''.join(f"{str(r['scale']) + 'x':>22}" for r in results)
+    print(f"\n{'':<{width}}{header}")
+    print(f"{'feeds / items':<{width}}" + ''.join(f"{r['feeds']:>10} / {r['items']:<9}" for r in results))
+    print(f"{'http requests':<{width}}" + ''.join(f"{r['http_requests']:>22}" for r in results))
+    print(f"{'MB served':<{width}}" + ''.join(f"{r['bytes_served'] / 1e6:>22.1f}" for r in results))
+    print(f"{'llm calls / 429s':<{width}}"
+          + ''.join(f"{r['llm']['calls']:>10} / {r['llm']['rate_limited']:<9}" for r in results))
+    print(f"{'stage':<{width}}" + ''.join(f"{'time':>12}{'peak' if memory else '':>10}" for _ in results))
+    for name in names:
+        label = name if name in STAGES else f"  {name}"
+        row = f"{label:<{width}}"
+        for r in results:
+            stage = r['stages'].get(name)
+            if stage is None:
+                row += f"{'-':>22}"
+                continue
+            peak = f"{stage['peak_kb'] / 1024:.1f}MB" if stage['peak_kb'] is not None else ''
+            row += f"{stage['seconds']:>11.2f}s{peak:>10}"
+        print(row)
+    print(f"{'total':<{width}}" + ''.join(f"{r['total_s']:>11.2f}s{'':>10}" for r in results))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100], help='feed volume multipliers')
+    parser.add_argument('--http-latency', type=float, default=0.0, help='seconds added to every HTTP response')
+    parser.add_argument('--llm-latency', default='0',
+                        help='fake model latency: seconds, uniform:<low>:<high> or lognormal:<median>:<sigma>')
+    parser.add_argument('--llm-429-rate', type=float, default=0.0, help='share of model calls answered with a 429')
+    parser.add_argument('--llm-malformed-rate', type=float, default=0.0,
+                        help='share of model responses that do not parse')
+    parser.add_argument('--llm-seed', type=int, default=1, help='seed for the injected latency and failures')
+    parser.add_argument('--llm-rpm', type=int, default=100000, help='curator LLM requests per minute')
+    parser.add_argument('--host-interval', type=float, default=0.0, help='seconds between scrapes of one host')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc run (no peak memory column)')
+    parser.add_argument('--keep-traces', action='store_true', help='copy each trace to data/traces/')
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--verbose', action='store_true', help='show the pipeline output and INFO logs')
+    parser.add_argument('--child-scale', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--child-memory', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--child-out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    if args.child_scale is not None:
+        result = run_scale(args.child_scale, args, track_memory=args.child_memory)
+        with open(args.child_out, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = []
+    for scale in args.scales:
+        print(f"Running pipeline at {scale}x ...", flush=True)
+        result = run_isolated(scale, args, track_memory=False)
+        results.append(result)
+        if 'error' in result:
+            print(f"  failed: {result['error']}", flush=True)
+            continue
+        print(f"  {result['total_s']:.2f}s", flush=True)
+        if args.memory:
+            print(f"Measuring memory at {scale}x ...", flush=True)
+            profiled = run_isolated(scale, args, track_memory=True)
+            for name, stage in result['stages'].items():
+                stage['peak_kb'] = profiled.get('stages', {}).get(name, {}).get('peak_kb')
+
+    print_report(results, args.memory)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,158 @@
+"""
+Benchmark NewsletterGenerator rendering at archive-page sizes.
+
+Builds a curated-data fixture of N articles by cycling the stories in
+data/loading/newsletter_curated.json, renders the page at several sizes and reports
+time per article, which should stay flat (linear-time output). Also times a reference
+copy of the original `html += ...` content builder and checks both produce the same
+content HTML.
+
+Run from the repository root:
+    python benchmarks/bench_render_newsletter.py [--articles 1000] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.getcwd(), 'src', 'mvp_news_aggregator'))
+
+from web_newsletter import NewsletterGenerator, NZ_TZ
+from datetime import datetime
+
+CURATED_FILE = 'data/loading/newsletter_curated.json'
+
+
+def build_fixture(total_articles: int) -> dict:
+    """Curated data with `total_articles` stories, split evenly between top stories and quick reads"""
+    with open(CURATED_FILE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    stories = [story for data in source.values()
+               for story in data.get('top_stories', []) + data.get('quick_reads', [])]
+
+    data = {category: {'top_stories': [], 'quick_reads': []} for category in ['world', 'tech', 'finance', 'nz']}
+    categories = list(data)
+    for i in range(total_articles):
+        story = dict(stories[i % len(stories)], title=f"{stories[i % len(stories)]['title']} #{i}")
+        bucket = 'top_stories' if i % 2 == 0 else 'quick_reads'
+        data[categories[i % len(categories)]][bucket].append(story)
+    return data
+
+
+def original_generate_content(generator: NewsletterGenerator, data: dict) -> str:
+    """Reference copy of the pre-template content builder (string concatenation)"""
+    def article_html(article, tier):
+        css_class = {"critical": "article critical", "key": "article key",
+                     "monitoring": "article monitoring"}.get(tier, "article")
+        try:
+            if isinstance(article.get('published'), str):
+                pub_date = datetime.fromisoformat(article['published'].replace('Z', '+00:00'))
+                formatted_date = pub_date.astimezone(NZ_TZ).strftime('%d %b %Y, %-I:%M %p %Z')
+            else:
+                formatted_date = "Recent"
+        except Exception:
+            formatted_date = "Recent"
+
+        html = f'<div class="{css_class}">'
+        html += f'<div class="article-header">'
+        html += f'<span class="category-badge {article.get("category_label", "")}">{article.get("category_display", "")}</span>'
+        html += f'<div class="article-title"><a href="{article.get("url", "#")}" target="_blank">{article.get("title", "No Title")}</a></div>'
+        html += f'</div>'
+        html += f'<div class="article-meta">{article.get("source", "Unknown")} • {formatted_date}'
+        if tier != "monitoring" and article.get('importance_score'):
+            html += f' • Priority: {article["importance_score"]}/10'
+        html += f'</div>'
+        if tier == "critical" or tier == "key":
+            if article.get('enhanced_summary'):
+                html += f'<div class="article-summary">{article["enhanced_summary"]}</div>'
+                if article.get('why_matters'):
+                    html += f'<div class="why-matters"><strong>Why this matters:</strong> {article["why_matters"]}</div>'
+            elif article.get('llm_summary'):
+                html += f'<div class="article-summary">{article["llm_summary"]}</div>'
+            elif article.get('description'):
+                html += f'<div class="article-summary">{article["description"]}</div>'
+        elif tier == "monitoring" and article.get('llm_reason'):
+            html += f'<div class="article-reason">{article["llm_reason"]}</div>'
+        html += '</div>'
+        return html
+
+    all_top_stories, all_quick_reads = [], []
+    for category, articles in data.items():
+        all_top_stories.extend(articles.get('top_stories', []))
+        all_quick_reads.extend(articles.get('quick_reads', []))
+    all_top_stories.sort(key=lambda x: x.get('importance_score', 5), reverse=True)
+    category_priority = {'tech': 1, 'world': 2, 'finance': 3, 'nz': 4}
+    all_quick_reads.sort(key=lambda x: category_priority.get(x.get('category_label', ''), 5))
+
+    content = '<div class="content">'
+    for story in all_top_stories:
+        content += article_html(story, tier="critical" if story in all_top_stories[:5] else "key")
+    for read in all_quick_reads:
+        content += article_html(read, tier="monitoring")
+    content += '</div>'
+    return content
+
+
+def best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=1000, help='largest page size to render')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    generator = NewsletterGenerator()
+    sizes = sorted({max(1, args.articles // 8), max(1, args.articles // 4), max(1, args.articles // 2),
+                    args.articles, args.articles * 2})
+
+    print(f"{'articles':>9} {'content ms':>11} {'us/article':>11} {'original ms':>12} {'page KB':>8}")
+    for size in sizes:
+        data = build_fixture(size)
+        # load_curated_data adds the display labels; go through it so both paths see the same input
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(data, f)
+            fixture_path = f.name
+        try:
+            data = generator.load_curated_data(fixture_path)
+            new_s = best_of(lambda: generator.generate_content(data), args.repeat)
+            old_s = best_of(lambda: original_generate_content(generator, data), args.repeat)
+            if generator.generate_content(data) != original_generate_content(generator, data):
+                print(f"  WARNING: content HTML differs at {size} articles")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                page = generator.generate_html(fixture_path)
+        finally:
+            os.remove(fixture_path)
+
+        print(f"{size:>9} {new_s * 1000:>11.2f} {new_s / size * 1e6:>11.1f} {old_s * 1000:>12.2f} {len(page) / 1024:>8.0f}")
+
+    # Streaming straight to a file - no full-page string is ever built
+    data_path = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8')
+    with data_path as f:
+        json.dump(build_fixture(args.articles), f)
+    out_path = data_path.name.replace('.json', '.html')
+    try:
+        start = time.perf_counter()
+        with open(out_path, 'w', encoding='utf-8') as out, contextlib.redirect_stdout(io.StringIO()):
+            generator.render_html(out.write, data_path.name)
+        print(f"Full page ({args.articles} articles) streamed to file in {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        os.remove(data_path.name)
+        if os.path.exists(out_path):
+            os.remove(out_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Recorded fixtures for running the daily pipeline offline.
+
+Everything is derived deterministically from files already in the repo:
+- RSS feeds from the stories in data/loading/newsletter_curated_*.json
+- article pages from the story text of archive/*.html
+- exchangerate-api and yfinance payloads from data/loading/fx_data.json and market_data.json
+
+A fake requests transport serves the feeds, pages and FX responses, a fake
+yfinance.download serves prices, and the pipeline's own fake LLM backend
+(llm_backends.FakeLLMBackend) answers every prompt. `offline_pipeline()` installs
+all of them for the duration of a run.
+"""
+
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+CURATED_GLOB = 'data/loading/newsletter_curated_*.json'
+ARCHIVE_GLOB = 'archive/*.html'
+FX_FILE = 'data/loading/fx_data.json'
+MARKET_FILE = 'data/loading/market_data.json'
+
+FEED_HOST = 'feeds{n}.bench.test'
+ARTICLE_HOST = 'news{n}.bench.test'
+ARTICLE_HOSTS = 50
+ITEMS_PER_FEED = 50  # the collector reads at most 50 entries per feed
+FEEDS_PER_CATEGORY = {'world': 2, 'tech': 2, 'finance': 3}
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+
+
+class OfflineFixtures:
+    """Feeds, article pages and market payloads for one benchmark scale"""
+
+    def __init__(self, repo_root: str, scale: int = 1, now: Optional[datetime] = None):
+        self.repo_root = repo_root
+        self.scale = scale
+        self.now = now or datetime.now(timezone.utc)
+        self.stories = self._load_stories()
+        self.paragraphs = self._load_archive_paragraphs()
+        self.fx_days = self._load_fx_days()
+        self.market = self._load_market()
+
+        self.sources = {}
+        self.feeds = {}
+        self.pages = {}
+        self._build_feeds()
+
+    # --- seed data -------------------------------------------------------------------
+
+    def _load_stories(self) -> Dict[str, List[Dict]]:
+        stories = {}
+        seen = set()
+        for path in sorted(glob.glob(os.path.join(self.repo_root, CURATED_GLOB))):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for category, sections in data.items():
+                for story in sections.get('top_stories', []) + sections.get('quick_reads', []):
+                    if story.get('url') in seen or not story.get('title'):
+                        continue
+                    seen.add(story['url'])
+                    stories.setdefault(category, []).append(story)
+        return stories
+
+    def _load_archive_paragraphs(self) -> List[str]:
+        paragraphs = []
+        for path in sorted(glob.glob(os.path.join(self.repo_root, ARCHIVE_GLOB))):
+            with open(path, 'r', encoding='utf-8') as f:
+                soup = BeautifulSoup(f.read(), 'lxml')
+            for element in soup.select('.article-summary, .why-matters, .article-reason'):
+                text = element.get_text(' ', strip=True)
+                if len(text) > 60:
+                    paragraphs.append(text)
+        return paragraphs
+
+    def _load_fx_days(self) -> List[Dict[str, float]]:
+        with open(os.path.join(self.repo_root, FX_FILE), 'r', encoding='utf-8') as f:
+            daily_rates = json.load(f)['daily_rates']
+        return [daily_rates[date] for date in sorted(daily_rates)]
+
+    def _load_market(self) -> Dict:
+        with open(os.path.join(self.repo_root, MARKET_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    # --- feeds and pages -------------------------------------------------------------
+
+    def _variant(self, pool: List[Dict], index: int) -> Dict:
+        """
+        Story number `index` of a category. Past the end of the real pool, titles and
+        descriptions are stitched from thirds of three different stories, so scaled-up
+        feeds carry mostly distinct headlines rather than exact repeats.
+        """
+        base = pool[index % len(pool)]
+        round_number = index // len(pool)
+        if round_number == 0:
+            return dict(base)
+
+        picks = [pool[(index + round_number * step) % len(pool)] for step in (0, 7, 13)]
+
+        def stitch(field: str) -> str:
+            parts = []
+            for i, story in enumerate(picks):
+                words = (story.get(field) or '').split()
+                third = max(1, len(words) // 3)
+                parts.extend(words[i * third:(i + 1) * third])
+            return ' '.join(parts)
+
+        return dict(base, title=stitch('title') or base['title'], description=stitch('description'))
+
+    def _build_feeds(self):
+        feed_number = 0
+        for category, feeds_per_copy in FEEDS_PER_CATEGORY.items():
+            pool = self.stories.get(category, [])
+            if not pool:
+                continue
+            self.sources[category] = []
+            for copy in range(self.scale):
+                for slot in range(feeds_per_copy):
+                    feed_number += 1
+                    name = f"Bench {category.title()} {feed_number}"
+                    url = f"https://{FEED_HOST.format(n=feed_number)}/{category}/rss.xml"
+                    self.sources[category].append({'name': name, 'url': url})
+
+                    start = (copy * feeds_per_copy + slot) * ITEMS_PER_FEED
+                    items = [self._variant(pool, start + i) for i in range(ITEMS_PER_FEED)]
+                    self.feeds[url] = self._render_feed(name, items, feed_number)
+
+    def _render_feed(self, name: str, items: List[Dict], feed_number: int) -> bytes:
+        entries = []
+        for i, story in enumerate(items):
+            article_id = f"{feed_number}-{i}"
+            url = f"https://{ARTICLE_HOST.format(n=_digest(article_id) % ARTICLE_HOSTS)}/story/{article_id}"
+            self.pages[url] = story
+            # Spread over the last 20 hours so everything passes the curator's 24h window
+            published = self.now - timedelta(minutes=(_digest(article_id) % 1200) + 1)
+            entries.append(
+                '<item>'
+                f'<title>{escape(story["title"])}</title>'
+                f'<link>{escape(url)}</link>'
+                f'<description>{escape(story.get("description") or "")}</description>'
+                f'<pubDate>{format_datetime(published)}</pubDate>'
+                f'<guid>{escape(url)}</guid>'
+                '</item>'
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>{escape(name)}</title><link>https://bench.test/</link><description>Recorded feed</description>'
+            f'{"".join(entries)}</channel></rss>'
+        ).encode('utf-8')
+
+    def article_html(self, url: str) -> bytes:
+        """A news page around the story: navigation, the body text and footer boilerplate"""
+        story = self.pages[url]
+        start = _digest(url) % max(1, len(self.paragraphs))
+        count = 8 + _digest(url[::-1]) % 10
+        body = [self.paragraphs[(start + i) % len(self.paragraphs)] for i in range(count)] if self.paragraphs else []
+        paragraphs = ''.join(f'<p>{escape(text)}</p>' for text in [story.get('description') or ''] + body)
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{escape(story["title"])}</title></head><body>'
+            '<header><nav><a href="/">Home</a> <a href="/world">World</a> <a href="/tech">Tech</a></nav></header>'
+            f'<main><article><h1>{escape(story["title"])}</h1>{paragraphs}'
+            '<p>Subscribe to our newsletter for more stories like this.</p></article></main>'
+            '<aside>Related articles: more from our newsroom</aside>'
+            '<footer>Privacy policy | Terms of service | Cookie policy</footer>'
+            '</body></html>'
+        ).encode('utf-8')
+
+    # --- FX and market payloads ------------------------------------------------------
+
+    def fx_payload(self, date_str: Optional[str] = None) -> bytes:
+        """exchangerate-api style response; recorded days are cycled through by date"""
+        day = self.fx_days[_digest(date_str or 'latest') % len(self.fx_days)]
+        rates = {pair.split('/')[1]: value for pair, value in day.items()}
+        return json.dumps({'base': 'NZD', 'date': date_str or self.now.strftime('%Y-%m-%d'),
+                           'rates': rates}).encode('utf-8')
+
+    def yf_download(self, tickers, start=None, end=None, **kwargs) -> pd.DataFrame:
+        """Stand-in for yfinance.download: recorded closes laid over the requested business days"""
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        dates = pd.bdate_range(start=start, end=end, inclusive='left') if start else pd.bdate_range(end=end, periods=22)
+        recorded = [self.market['daily_prices'][date] for date in sorted(self.market['daily_prices'])]
+
+        columns = pd.MultiIndex.from_product([['Close'], tickers])
+        values = [[recorded[i % len(recorded)].get(ticker) for ticker in tickers] for i in range(len(dates))]
+        return pd.DataFrame(values, index=dates, columns=columns, dtype=float)
+
+
+class FakeTransport:
+    """Stands in for every requests adapter, answering from the fixtures instead of the network"""
+
+    def __init__(self, fixtures: OfflineFixtures, latency: float = 0.0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.requests = 0
+        self.bytes_served = 0
+
+    def send(self, request, **kwargs):
+        url = request.url
+        if self.latency:
+            time.sleep(self.latency)
+
+        status, content_type, body = 404, 'text/plain', b'not recorded'
+        history = re.search(r'exchangerate-api\.com/v4/history/NZD/(\d{4}-\d{2}-\d{2})', url)
+        if url in self.fixtures.feeds:
+            status, content_type, body = 200, 'application/rss+xml; charset=utf-8', self.fixtures.feeds[url]
+        elif url in self.fixtures.pages:
+            status, content_type, body = 200, 'text/html; charset=utf-8', self.fixtures.article_html(url)
+        elif history:
+            status, content_type, body = 200, 'application/json', self.fixtures.fx_payload(history.group(1))
+        elif 'exchangerate-api.com/v4/latest/NZD' in url:
+            status, content_type, body = 200, 'application/json', self.fixtures.fx_payload()
+
+        response = requests.models.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict({'Content-Type': content_type})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.url = url
+        response.request = request
+        response.reason = 'OK' if status == 200 else 'Not Found'
+
+        self.requests += 1
+        self.bytes_served += len(body)
+        return response
+
+
+@contextlib.contextmanager
+def offline_pipeline(fixtures: OfflineFixtures, http_latency: float = 0.0, llm_settings: Optional[Dict] = None):
+    """
+    Route HTTP and yfinance to the fixtures and the LLM to the fake backend for the
+    duration of the block. `llm_settings` are FAKE_LLM_* environment variables
+    (latency, 429 rate, malformed rate...), see llm_backends.
+    """
+    import yfinance
+
+    transport = FakeTransport(fixtures, latency=http_latency)
+    original_send = requests.adapters.HTTPAdapter.send
+    original_download = yfinance.download
+    environment = {'LLM_BACKEND': 'fake', **(llm_settings or {})}
+    original_environment = {name: os.environ.get(name) for name in environment}
+
+    requests.adapters.HTTPAdapter.send = lambda adapter, request, **kwargs: transport.send(request, **kwargs)
+    yfinance.download = fixtures.yf_download
+    os.environ.update(environment)
+    try:
+        yield transport
+    finally:
+        requests.adapters.HTTPAdapter.send = original_send
+        yfinance.download = original_download
+        for name, value in original_environment.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
@@ -0,0 +1,212 @@
+import re
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+import requests
+from bs4 import BeautifulSoup
+try:
+    import lxml  # noqa: F401 - only needed so BeautifulSoup can use the faster parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+# Content selectors in priority order (works for most news sites)
+CONTENT_SELECTORS = [
+    'article',
+    '[data-module="ArticleBody"]',
+    '.article-content',
+    '.article-body',
+    '.post-content',
+    '.entry-content',
+    '.story-body',
+]
+
+# Elements that never hold article text - dropped before text extraction
+NOISE_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'nav']
+
+# Page chrome around the article - only dropped when falling back to all paragraphs, since
+# inside a matched content element these hold bylines and pull quotes
+CHROME_TAGS = ['header', 'footer', 'aside']
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; NewsBot/1.0)'
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?:\.(?P<cls>[\w-]+))?(?:\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"\])?$')
+
+
+def compile_selector(selector: str) -> Optional[Callable]:
+    """Turn a simple tag / .class / [attr="value"] selector into a predicate, or None if it's not simple"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.groupdict().values()):
+        return None
+    tag, cls, attr, value = match.group('tag'), match.group('cls'), match.group('attr'), match.group('value')
+
+    def predicate(element) -> bool:
+        if tag and element.name != tag:
+            return False
+        if cls and cls not in (element.get('class') or ()):
+            return False
+        if attr and element.get(attr) != value:
+            return False
+        return True
+
+    return predicate
+
+
+class ArticleExtractor:
+    """
+    Single article extraction engine shared by the curator and scrapper.
+
+    Streams the response with a byte cap (huge pages are never fully buffered), parses
+    the document exactly once (lxml when installed, html.parser otherwise), then picks
+    the content element from a selector priority table, falling back to all paragraphs.
+    Every call records per-stage timings so slow sites are easy to spot.
+    """
+
+    def __init__(self,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 timeout: float = 10,
+                 max_bytes: int = 1_500_000,
+                 min_content_chars: int = 200,
+                 selectors: Optional[List[str]] = None,
+                 session: Optional[requests.Session] = None,
+                 pool_size: int = 16):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.min_content_chars = min_content_chars
+        self.selectors = selectors or CONTENT_SELECTORS
+        self.compiled_selectors = [compile_selector(selector) for selector in self.selectors]
+        self.parser = HTML_PARSER
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        session.headers.update({'User-Agent': user_agent})
+        self.session = session
+
+    def fetch(self, url: str) -> Dict:
+        """Download up to max_bytes of the page body"""
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+
+            chunks = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= self.max_bytes:
+                    truncated = True
+                    break
+
+            # Only trust the declared charset; otherwise let the parser sniff it
+            content_type = response.headers.get('Content-Type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+
+        return {
+            'body': b''.join(chunks)[:self.max_bytes],
+            'encoding': encoding,
+            'truncated': truncated
+        }
+
+    def extract_from_html(self, html, encoding: Optional[str] = None) -> Dict:
+        """Parse HTML once and pull out the main article text"""
+        timings = {}
+
+        start = time.perf_counter()
+        soup = BeautifulSoup(html, self.parser, from_encoding=encoding) if isinstance(html, bytes) \
+            else BeautifulSoup(html, self.parser)
+        timings['parse_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for tag in soup(NOISE_TAGS):
+            tag.decompose()
+        timings['clean_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matches = self._first_matches(soup)
+
+        text = ''
+        matched = None
+        for selector, element in zip(self.selectors, matches):
+            if element is None:
+                continue
+            candidate = element.get_text(separator=' ', strip=True)
+            if len(candidate) >= self.min_content_chars:
+                text, matched = candidate, selector
+                break
+            # Keep short matches as a last resort if paragraphs find nothing
+            if len(candidate) > len(text):
+                text, matched = candidate, selector
+
+        if matched is None or len(text) < self.min_content_chars:
+            # Fallback: all paragraphs outside the page chrome
+            for tag in soup(CHROME_TAGS):
+                tag.decompose()
+            paragraphs = ' '.join(p.get_text(strip=True) for p in soup.find_all('p'))
+            if len(paragraphs) > len(text):
+                text, matched = paragraphs, 'p'
+        timings['select_ms'] = (time.perf_counter() - start) * 1000
+
+        return {
+            'text': text,
+            'selector': matched,
+            'title': soup.title.string.strip() if soup.title and soup.title.string else None,
+            'timings': timings
+        }
+
+    def _first_matches(self, soup) -> List:
+        """First element matching each selector, found in a single walk of the tree"""
+        matches = [None] * len(self.selectors)
+        pending = [i for i, predicate in enumerate(self.compiled_selectors) if predicate is not None]
+
+        for element in soup.find_all(True):
+            if not pending:
+                break
+            for i in list(pending):
+                if self.compiled_selectors[i](element):
+                    matches[i] = element
+                    pending.remove(i)
+
+        # Anything too complex for the fast matcher goes through soupsieve
+        for i, predicate in enumerate(self.compiled_selectors):
+            if predicate is None:
+                matches[i] = soup.select_one(self.selectors[i])
+        return matches
+
+    def extract(self, url: str) -> Dict:
+        """Fetch and extract a URL. Returns text (None on failure), matched selector, bytes and stage timings."""
+        start = time.perf_counter()
+        try:
+            page = self.fetch(url)
+        except Exception as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return {'url': url, 'text': None, 'selector': None, 'bytes': 0, 'truncated': False,
+                    'timings': {'fetch_ms': (time.perf_counter() - start) * 1000}, 'error': str(e)}
+        fetch_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            result = self.extract_from_html(page['body'], page['encoding'])
+        except Exception as e:
+            logger.warning(f"Failed to extract {url}: {e}")
+            return {'url': url, 'text': None, 'selector': None, 'bytes': len(page['body']),
+                    'truncated': page['truncated'], 'timings': {'fetch_ms': fetch_ms}, 'error': str(e)}
+
+        result['timings'] = {'fetch_ms': fetch_ms, **result['timings']}
+        result.update({
+            'url': url,
+            'text': result['text'] or None,
+            'bytes': len(page['body']),
+            'truncated': page['truncated']
+        })
+
+        timings = result['timings']
+        logger.debug(
+            f"Extracted {len(result['text'] or '')} chars from {url} via '{result['selector']}' "
+            f"(fetch {timings['fetch_ms']:.0f}ms, parse {timings['parse_ms']:.0f}ms, "
+            f"select {timings['select_ms']:.0f}ms, {result['bytes']} bytes{', truncated' if result['truncated'] else ''})"
+        )
+        return result
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local storage file
+ARTICLE_STORE_FILE = 'data/cache/articles.db'
+
+
+def _to_utc_iso(value) -> str:
+    """Normalise a datetime or ISO string to a UTC ISO string so stored values sort lexically"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            value = datetime.now(timezone.utc)
+    if value is None:
+        value = datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class ArticleStore:
+    """
+    Durable, append-only article log keyed by ArticleCollector.generate_article_id.
+
+    Revives the articles schema sketched in database.py, but uses the collector's
+    hash ID as the primary key so each run only inserts articles it has not seen
+    before, and the recent window is a range query on the published index.
+    """
+
+    def __init__(self, db_path: str = ARTICLE_STORE_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.init_database()
+
+    def get_connection(self):
+        """Get a database connection"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        return conn
+
+    def init_database(self):
+        """Initialize database with tables and indexes"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    description TEXT,
+                    source TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    published TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_category_published ON articles(category, published)")
+            conn.commit()
+
+    def insert_articles(self, results: Dict[str, List[Dict]]) -> int:
+        """Append collector results, skipping IDs already in the log. Returns count of new articles."""
+        rows = []
+        for category, articles in results.items():
+            for article in articles:
+                rows.append((
+                    article['id'],
+                    article.get('title', 'No Title'),
+                    article.get('url', ''),
+                    article.get('description'),
+                    article.get('source', 'Unknown'),
+                    article.get('category', category),
+                    _to_utc_iso(article.get('published')),
+                    _to_utc_iso(article.get('fetched_at'))
+                ))
+
+        if not rows:
+            return 0
+
+        with self.get_connection() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO articles (
+                    id, title, url, description, source, category, published, fetched_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = conn.total_changes - before
+            conn.commit()
+
+        logger.info(f"Article store: {inserted} new / {len(rows)} collected articles")
+        return inserted
+
+    def get_recent_articles(self, hours: int = 24, categories: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Load articles published in the last `hours` via the published index.
+
+        Rows come back in insertion (feed) order, grouped by category in the order given,
+        matching the collector results the curator used to filter in memory.
+        """
+        cutoff = _to_utc_iso(datetime.now(timezone.utc) - timedelta(hours=hours))
+
+        query = "SELECT * FROM articles WHERE published >= ?"
+        params = [cutoff]
+
+        if categories is not None:
+            categories = list(categories)
+            if not categories:
+                return []
+            placeholders = ','.join(['?'] * len(categories))
+            query += f" AND category IN ({placeholders})"
+            params.extend(categories)
+
+        query += " ORDER BY rowid"
+
+        with self.get_connection() as conn:
+            cursor = conn.execute(query, params)
+            articles = [dict(row) for row in cursor.fetchall()]
+
+        if categories is not None:
+            rank = {category: i for i, category in enumerate(categories)}
+            articles.sort(key=lambda article: rank[article['category']])
+        return articles
+
+    def cleanup_old_articles(self, days_old: int = 30) -> int:
+        """Remove articles published more than `days_old` days ago"""
+        cutoff = _to_utc_iso(datetime.now(timezone.utc) - timedelta(days=days_old))
+
+        with self.get_connection() as conn:
+            cursor = conn.execute("DELETE FROM articles WHERE published < ?", (cutoff,))
+            deleted_count = cursor.rowcount
+            conn.commit()
+
+        if deleted_count:
+            logger.info(f"Cleaned up {deleted_count} old articles")
+        return deleted_count
@@ -8,24 +8,38 @@ from datetime import datetime, timezone
 from typing import List, Dict, Optional
 import logging
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 sys.path.append(os.getcwd())
 
 from src.mvp_news_aggregator.sources import RSS_FEEDS
+from src.mvp_news_aggregator.feed_cache import FeedCache
+from src.mvp_news_aggregator.article_store import ArticleStore
+from src.mvp_news_aggregator.rate_limit import HostRateLimiter
+from src.mvp_news_aggregator.tracing import span, in_current_span
 # from database import NewsletterDB  # Removed for JSON migration
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 class ArticleCollector:
-    def __init__(self, sources: Dict):
+    def __init__(self, sources: Dict, max_workers: int = 16, max_per_host: int = 1, host_interval: float = 1.0,
+                 use_feed_cache: bool = True):
         self.sources = sources
+        self.feed_cache = FeedCache() if use_feed_cache else None
+        self.max_workers = max_workers
+        self.host_limiter = HostRateLimiter(max_per_host=max_per_host, min_interval=host_interval)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Daily Brief Newsletter/1.0 (https://example.com)'
         })
+        # Connection pool large enough for every worker thread
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def generate_article_id(self, title: str, url: str) -> str:
         """Generate consistent hash-based ID for articles"""
@@ -36,11 +50,32 @@ class ArticleCollector:
     
     def fetch_feed(self, feed_url: str, source_name: str) -> List[Dict]:
         """Fetch and parse a single RSS feed"""
+        with span(source_name, 'feed', url=feed_url) as feed_span:
+            articles = self._fetch_feed(feed_url, source_name, feed_span)
+            feed_span.set(items=len(articles))
+            return articles
+    
+    def _fetch_feed(self, feed_url: str, source_name: str, feed_span) -> List[Dict]:
+        """fetch_feed body; response status and size are recorded on feed_span"""
         try:
             logger.info(f"Fetching feed: {source_name} ({feed_url})")
             
+            # Send validators from the last run so unchanged feeds come back as 304
+            headers = self.feed_cache.conditional_headers(feed_url) if self.feed_cache else {}
+            
             # Use requests session for better control
-            response = self.session.get(feed_url, timeout=10)
+            response = self.session.get(feed_url, timeout=10, headers=headers)
+            feed_span.set(status=response.status_code, bytes=len(response.content))
+            
+            if response.status_code == 304 and self.feed_cache:
+                cached = self.feed_cache.get_articles(feed_url)
+                if cached is not None:
+                    logger.info(f"Feed unchanged (304), reused {len(cached)} cached articles from {source_name}")
+                    return cached
+                # Validators without cached entries - refetch unconditionally
+                response = self.session.get(feed_url, timeout=10)
+                feed_span.set(status=response.status_code, bytes=len(response.content))
+            
             response.raise_for_status()
             
             # Parse with feedparser
@@ -55,6 +90,9 @@ class ArticleCollector:
                 if article:
                     articles.append(article)
             
+            if self.feed_cache:
+                self.feed_cache.store(feed_url, response.headers, [dict(a) for a in articles])
+            
             logger.info(f"Collected {len(articles)} articles from {source_name}")
             return articles
             
@@ -119,25 +157,80 @@ class ArticleCollector:
         all_articles = []
         category_sources = self.sources[category]
         
-        for source in category_sources:
-            articles = self.fetch_feed(source['url'], source['name'])
-            # Add category to each article
-            for article in articles:
-                article['category'] = category
-            all_articles.extend(articles)
-            
-            # Be nice to servers - small delay between requests
-            time.sleep(1)
+        with span(category, 'category') as category_span:
+            for source in category_sources:
+                articles = self.fetch_feed(source['url'], source['name'])
+                # Add category to each article
+                for article in articles:
+                    article['category'] = category
+                all_articles.extend(articles)
+                
+                # Be nice to servers - small delay between requests
+                time.sleep(1)
+            category_span.set(feeds=len(category_sources), items=len(all_articles))
         
         return all_articles
     
-    def collect_all(self) -> Dict[str, List[Dict]]:
+    def _fetch_feed_polite(self, feed_url: str, source_name: str) -> List[Dict]:
+        """Fetch a feed while holding its host's politeness slot"""
+        host = self.host_limiter.acquire(feed_url)
+        try:
+            return self.fetch_feed(feed_url, source_name)
+        finally:
+            self.host_limiter.release(host)
+    
+    def collect_all_concurrent(self) -> Dict[str, List[Dict]]:
+        """Fetch every feed across all categories in parallel.
+        
+        Politeness is enforced per host by HostRateLimiter rather than a global sleep,
+        so total time is roughly that of the slowest host instead of the sum of all feeds.
+        """
+        jobs = []
+        for category, category_sources in self.sources.items():
+            for source in category_sources:
+                jobs.append((category, source))
+        
+        results = {category: [] for category in self.sources.keys()}
+        if not jobs:
+            return results
+        
+        # Feeds of one category run on different threads, so each gets its own category span
+        @in_current_span
+        def fetch_job(category: str, source: Dict) -> List[Dict]:
+            with span(category, 'category'):
+                return self._fetch_feed_polite(source['url'], source['name'])
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            futures = [
+                executor.submit(fetch_job, category, source)
+                for category, source in jobs
+            ]
+            # Merge in submission order so output matches the sequential path
+            for (category, _), future in zip(jobs, futures):
+                articles = future.result()
+                for article in articles:
+                    article['category'] = category
+                results[category].extend(articles)
+        
+        return results
+    
+    def collect_all(self, concurrent: bool = True) -> Dict[str, List[Dict]]:
         """Collect articles from all categories"""
-        results = {}
+        start = time.monotonic()
+        
+        if concurrent:
+            logger.info(f"Collecting articles concurrently for categories: {', '.join(self.sources.keys())}")
+            results = self.collect_all_concurrent()
+        else:
+            results = {}
+            for category in self.sources.keys():
+                logger.info(f"Collecting articles for category: {category}")
+                results[category] = self.collect_by_category(category)
         
-        for category in self.sources.keys():
-            logger.info(f"Collecting articles for category: {category}")
-            results[category] = self.collect_by_category(category)
+        logger.info(f"Collection took {time.monotonic() - start:.1f}s")
+        
+        if self.feed_cache:
+            self.feed_cache.save()
         
         # Summary logging
         total_articles = sum(len(articles) for articles in results.values())
@@ -145,20 +238,14 @@ class ArticleCollector:
         
         return results
     
-    # def collect_and_store_all(self, db_path: str = "data/newsletter.db") -> Dict[str, int]:
-    #     """Collect all articles and store them in database"""
-    #     all_results = self.collect_all()
-    #     storage_results = {}
-        
-    #     db = NewsletterDB(db_path)
+    def collect_and_store_all(self, article_store: ArticleStore) -> Dict[str, List[Dict]]:
+        """Collect all articles and append newly seen ones to the article store"""
+        all_results = self.collect_all()
         
-    #     for category, articles in all_results.items():
-    #         if articles:
-    #             inserted_count = db.insert_articles_batch(articles)
-    #             storage_results[category] = inserted_count
-    #             logger.info(f"Stored {inserted_count} articles for {category}")
+        article_store.insert_articles(all_results)
+        article_store.cleanup_old_articles()
         
-    #     return storage_results
+        return all_results
 
 
 # # Test function
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import urllib.parse as urlparse
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local storage file
+CONTENT_CACHE_FILE = 'data/cache/scraped_content.db'
+
+TRACKING_PARAMS = ['utm_source', 'utm_medium', 'utm_campaign', 'utm_content',
+                   'utm_term', 'ref', 'source', 'fbclid', 'gclid']
+
+
+def normalize_url(url: str) -> str:
+    """Remove common tracking parameters and fragments from URLs"""
+    parsed = urlparse.urlparse(url.strip())
+
+    # Remove common tracking parameters
+    query_params = urlparse.parse_qs(parsed.query, keep_blank_values=True)
+    for param in TRACKING_PARAMS:
+        query_params.pop(param, None)
+
+    # Rebuild URL without tracking params, sorted so parameter order doesn't matter
+    clean_query = urlparse.urlencode(sorted(query_params.items()), doseq=True)
+    clean_url = urlparse.urlunparse((
+        parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip('/'),
+        parsed.params, clean_query, ''  # Remove fragment too
+    ))
+
+    return clean_url
+
+
+class ScrapedContentCache:
+    """
+    Persistent cache of scraped article text keyed by normalized URL.
+
+    Each entry records when it was fetched so stale entries can be skipped on read
+    and evicted by age. `kind` separates differently-processed text for the same URL.
+    """
+
+    def __init__(self, db_path: str = CONTENT_CACHE_FILE, max_age_days: float = 7):
+        self.db_path = db_path
+        self.max_age = timedelta(days=max_age_days)
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.init_database()
+
+    def get_connection(self):
+        """Get a database connection (one per call, so worker threads never share one)"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_database(self):
+        """Initialize cache table"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scraped_content (
+                    url TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (url, kind)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scraped_fetched_at ON scraped_content(fetched_at)")
+            conn.commit()
+
+    def get(self, url: str, kind: str = 'optimized') -> Optional[str]:
+        """Return cached content for a URL if present and younger than max_age"""
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat()
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT content FROM scraped_content WHERE url = ? AND kind = ? AND fetched_at >= ?",
+                (normalize_url(url), kind, cutoff)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, url: str, content: str, kind: str = 'optimized'):
+        """Store content for a URL with the current fetch timestamp"""
+        with self.get_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scraped_content (url, kind, content, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_url(url), kind, content, datetime.now(timezone.utc).isoformat())
+            )
+            conn.commit()
+
+    def evict_expired(self) -> int:
+        """Delete entries older than max_age, returning how many were removed"""
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.execute("DELETE FROM scraped_content WHERE fetched_at < ?", (cutoff,))
+            deleted_count = cursor.rowcount
+            conn.commit()
+
+        if deleted_count:
+            logger.info(f"Evicted {deleted_count} stale scraped-content entries")
+        return deleted_count
@@ -3,14 +3,25 @@ from typing import Dict, List, Optional
 import logging
 import json
 import re
-import google.generativeai as genai
+from functools import lru_cache
 from dotenv import load_dotenv
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
 import time
 import os
+import sys
 
-# from database import NewsletterDB
+sys.path.append(os.getcwd())
+
+from src.mvp_news_aggregator.article_store import ArticleStore
+from src.mvp_news_aggregator.near_duplicates import NearDuplicateDetector
+from src.mvp_news_aggregator.rate_limit import TokenBucket, HostRateLimiter
+from src.mvp_news_aggregator.llm_cache import LLMResponseCache, CachedResponse
+from src.mvp_news_aggregator.llm_backends import ModelBackend, create_model
+from src.mvp_news_aggregator.content_cache import ScrapedContentCache
+from src.mvp_news_aggregator.article_extractor import ArticleExtractor
+from src.mvp_news_aggregator.tracing import current_span, in_current_span, span
 
 if True:
     load_dotenv("../env/config.env")
@@ -19,14 +30,89 @@ if True:
 
 logger = logging.getLogger(__name__)
 
+# Common junk patterns in scraped article text, with the literal words each one needs to match.
+# Only patterns whose keywords appear in the text are compiled into the single-pass alternation.
+JUNK_PATTERNS = [
+    (r'subscribe\s+to\s+our\s+newsletter', ('subscribe',)),
+    (r'follow\s+us\s+on\s+social\s+media', ('follow',)),
+    (r'advertisement\s*:?', ('advertisement',)),
+    (r'related\s+articles?:?', ('related',)),
+    (r'more\s+from\s+\w+:?', ('more',)),
+    (r'read\s+more\s+about', ('read',)),
+    (r'sign\s+up\s+for', ('sign',)),
+    (r'cookies?\s+policy', ('cookie',)),
+    (r'terms\s+of\s+service', ('terms',)),
+    (r'privacy\s+policy', ('privacy',)),
+    (r'share\s+this\s+article', ('share',)),
+    (r'\bshare\b.*\bfacebook\b.*\btwitter\b', ('share', 'facebook', 'twitter')),
+    (r'loading\.\.\.?', ('loading',)),
+]
+
+
+@lru_cache(maxsize=None)
+def _compile_junk_patterns(indices: tuple):
+    """Combined alternation of the given JUNK_PATTERNS, in their original priority order"""
+    return re.compile('|'.join(f'(?:{JUNK_PATTERNS[i][0]})' for i in indices), re.IGNORECASE)
+
+
+def junk_regex_for(text: str):
+    """Precompiled junk regex covering only the patterns that can match `text`, or None"""
+    lowered = text.lower()
+    indices = tuple(i for i, (_, keywords) in enumerate(JUNK_PATTERNS)
+                    if all(keyword in lowered for keyword in keywords))
+    return _compile_junk_patterns(indices) if indices else None
+
+
+MAX_SENTENCES = 8
+MIN_SENTENCE_CHARS = 20
+
+
+def iter_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS):
+    """Yield whitespace-collapsed '.'-terminated sentences lazily, skipping fragments of min_chars or fewer"""
+    start = 0
+    length = len(text)
+    while start <= length:
+        end = text.find('.', start)
+        if end == -1:
+            end = length
+        sentence = ' '.join(text[start:end].split())
+        if len(sentence) > min_chars:
+            yield sentence + '.'
+        start = end + 1
+
 class ArticleCurator:
-    def __init__(self, db_path: str = "data/newsletter.db", use_llm: bool = True):
+    def __init__(self, db_path: str = "data/newsletter.db", use_llm: bool = True,
+                 article_store: Optional[ArticleStore] = None, llm_dedup_refine: bool = True,
+                 max_llm_workers: int = 4, llm_requests_per_minute: int = 60,
+                 use_llm_cache: bool = True, max_scrape_workers: int = 8, scrape_host_interval: float = 1.0,
+                 enhance_queue_size: int = 8, use_content_cache: bool = True,
+                 model: Optional[ModelBackend] = None):
         # self.db = NewsletterDB(db_path)
         self.use_llm = use_llm
+        self.article_store = article_store
+        self.llm_dedup_refine = llm_dedup_refine
+        self.duplicate_detector = NearDuplicateDetector()
+        
+        # Bounded concurrency for LLM calls, all sharing one request-rate budget
+        self.max_llm_workers = max_llm_workers
+        self.llm_limiter = TokenBucket(rate=llm_requests_per_minute / 60.0, capacity=max_llm_workers)
+        
+        # Scraping pool is limited per domain rather than with a global sleep
+        self.max_scrape_workers = max_scrape_workers
+        self.scrape_limiter = HostRateLimiter(max_per_host=1, min_interval=scrape_host_interval)
+        self.enhance_queue_size = enhance_queue_size
+        self.content_cache = ScrapedContentCache() if use_content_cache else None
+        self.extractor = ArticleExtractor(pool_size=max_scrape_workers)
+        
+        self.model_name = 'gemini-2.0-flash'
+        self.llm_cache = None
         
         if self.use_llm:
-            genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            # Gemini unless LLM_BACKEND picks another backend (e.g. 'fake' for load tests)
+            self.model = model or create_model(self.model_name)
+            self.model_name = self.model.model_name
+            if use_llm_cache:
+                self.llm_cache = LLMResponseCache()
         else:
             self.model = None
             print("🚫 LLM disabled - using simple fallback selection")
@@ -38,30 +124,47 @@ class ArticleCurator:
         print(f"Received results with categories: {list(results.keys())}")
         
         # Filter recent articles from passed results (no database query)
-        articles = self.get_recent_articles_from_results(results, hours)
+        with span('time_filter', 'curation') as step:
+            articles = self.get_recent_articles_from_results(results, hours)
+            step.set(items=len(articles))
         print(f"Found {len(articles)} recent articles after time filtering")
         
         # Continue with existing pipeline
-        clean_articles = self.basic_filter(articles)
+        with span('basic_filter', 'curation') as step:
+            clean_articles = self.basic_filter(articles)
+            step.set(items=len(clean_articles))
         print(f"Found {len(clean_articles)} articles after basic filtering")
         
-        clean_articles = self.deduplicate_articles(clean_articles)
+        with span('deduplicate', 'curation') as step:
+            clean_articles = self.deduplicate_articles(clean_articles)
+            step.set(items=len(clean_articles))
         print(f"Found {len(clean_articles)} articles after deduplication")
         
-        curated = self.llm_curate(clean_articles)
+        with span('llm_curate', 'curation', items=len(clean_articles)):
+            curated = self.llm_curate(clean_articles)
         print(f"LLM curated articles for categories: {list(curated.keys())}")
         
-        self.add_content_to_top_stories(curated)
+        with span('scrape_and_enhance', 'curation'):
+            self.add_content_to_top_stories(curated)
         print("Enhanced top stories with scraped content")
         
         self.save_to_json(curated)  # Save to JSON instead of database
         print("Saved curated data to JSON")
         
+        if self.llm_cache is not None:
+            logger.info(self.llm_cache.summary())
+        
         return curated
     
 
     def get_recent_articles_from_results(self, results: Dict[str, List[Dict]], hours: int) -> List[Dict]:
         """Filter recent articles from collector results (replaces database query)"""
+        if self.article_store is not None:
+            # Range query on the published index, includes articles seen in earlier runs
+            recent_articles = self.article_store.get_recent_articles(hours, categories=results.keys())
+            logger.info(f"Loaded {len(recent_articles)} recent articles from last {hours} hours via article store")
+            return recent_articles
+        
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
         
         recent_articles = []
@@ -124,12 +227,36 @@ class ArticleCurator:
         return filtered
     
     def deduplicate_articles(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles using LLM"""
-        if len(articles) <= 1 or not self.use_llm:
+        """Remove duplicate articles using local MinHash/LSH, with optional LLM check of borderline clusters"""
+        if len(articles) <= 1:
             return articles
         
-        # Extract titles for comparison
-        titles = [article.get('title', '') for article in articles]
+        start = time.perf_counter()
+        duplicate_groups, candidate_groups = self.duplicate_detector.find_groups(articles)
+        logger.info(f"Local dedup found {len(duplicate_groups)} duplicate groups, "
+                    f"{len(candidate_groups)} borderline clusters in {(time.perf_counter() - start) * 1000:.1f}ms")
+        
+        if self.use_llm and self.llm_dedup_refine and candidate_groups:
+            duplicate_groups.extend(self.llm_confirm_duplicates(articles, candidate_groups))
+        
+        # Remove duplicates (keep first from each group)
+        to_remove = set()
+        for group in duplicate_groups:
+            for idx in sorted(group)[1:]:
+                to_remove.add(idx)
+        
+        unique_articles = [article for i, article in enumerate(articles) if i not in to_remove]
+        
+        if len(to_remove) > 0:
+            logger.info(f"Removed {len(to_remove)} duplicate articles")
+        
+        return unique_articles
+    
+    def llm_confirm_duplicates(self, articles: List[Dict], candidate_groups: List[List[int]]) -> List[List[int]]:
+        """Ask the LLM which borderline candidate clusters really are the same story"""
+        # Number only the candidate titles, not the whole article list
+        candidate_indices = sorted({idx for group in candidate_groups for idx in group})
+        titles = [articles[idx].get('title', '') for idx in candidate_indices]
         
         prompt = f"""Find duplicate news stories from these titles:
 
@@ -139,27 +266,46 @@ Return JSON: {{"duplicates": [[1,3], [5,7]]}}
 Only group titles about the same specific event/announcement."""
 
         try:
-            # Use your existing Gemini model
-            response = self.model.generate_content(prompt)
+            response = self.generate_content(prompt)
             result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
             
-            # Remove duplicates (keep first from each group)
-            to_remove = set()
+            confirmed = []
             for group in result.get('duplicates', []):
-                for story_num in group[1:]:  # Skip first, remove rest
-                    to_remove.add(story_num - 1)  # Convert to 0-based
-            
-            # Filter out duplicates
-            unique_articles = [article for i, article in enumerate(articles) if i not in to_remove]
+                indices = [candidate_indices[n - 1] for n in group if 1 <= n <= len(candidate_indices)]
+                if len(indices) > 1:
+                    confirmed.append(indices)
+            return confirmed
             
-            if len(to_remove) > 0:
-                logger.info(f"Removed {len(to_remove)} duplicate articles")
+        except Exception as e:
+            logger.warning(f"LLM duplicate refinement failed: {e}, keeping local result")
+            self.discard_cached_response(prompt)
+            return []
+    
+    def generate_content(self, prompt: str):
+        """Call the LLM under the shared rate limit, serving repeated prompts from the response cache"""
+        with span(self.model_name, 'llm', prompt_chars=len(prompt)) as llm_span:
+            if self.llm_cache is None:
+                self.llm_limiter.acquire()
+                response = self.model.generate_content(prompt)
+                llm_span.set(response_chars=len(response.text))
+                return response
             
-            return unique_articles
+            key = self.llm_cache.make_key(self.model_name, prompt)
+            text = self.llm_cache.get(key)
+            if text is not None:
+                llm_span.set(cached=True, response_chars=len(text))
+                return CachedResponse(text)
             
-        except Exception as e:
-            logger.warning(f"Deduplication failed: {e}, returning original articles")
-            return articles
+            self.llm_limiter.acquire()
+            response = self.model.generate_content(prompt)
+            self.llm_cache.put(key, response.text, self.model_name)
+            llm_span.set(cached=False, response_chars=len(response.text))
+            return response
+    
+    def discard_cached_response(self, prompt: str):
+        """Forget a cached response that could not be used, so the next run asks again"""
+        if self.llm_cache is not None:
+            self.llm_cache.discard(self.llm_cache.make_key(self.model_name, prompt))
     
     def llm_curate(self, articles: List[Dict]) -> Dict:
         """LLM curation for all categories"""
@@ -171,10 +317,23 @@ Only group titles about the same specific event/announcement."""
                 by_category[cat] = []
             by_category[cat].append(article)
         
-        # Curate each category
-        result = {}
-        for category, cat_articles in by_category.items():
-            result[category] = self.curate_one_category(cat_articles, category)
+        @in_current_span
+        def curate(cat_articles: List[Dict], category: str) -> Dict:
+            with span(category, 'category', items=len(cat_articles)):
+                return self.curate_one_category(cat_articles, category)
+        
+        if not self.use_llm or len(by_category) <= 1:
+            return {category: curate(cat_articles, category)
+                    for category, cat_articles in by_category.items()}
+        
+        # Curate categories concurrently; merge in category order so output is deterministic
+        workers = min(self.max_llm_workers, len(by_category))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                category: executor.submit(curate, cat_articles, category)
+                for category, cat_articles in by_category.items()
+            }
+            result = {category: future.result() for category, future in futures.items()}
         
         return result
     
@@ -236,7 +395,7 @@ Only group titles about the same specific event/announcement."""
         Articles: {json.dumps(article_list)}"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.generate_content(prompt)
             llm_result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
             
             # Map back to full articles
@@ -261,6 +420,7 @@ Only group titles about the same specific event/announcement."""
             
         except Exception as e:
             logger.error(f"LLM error for {category}: {e}")
+            self.discard_cached_response(prompt)
             # Fallback: just take first few articles
             return {
                 "top_stories": articles[:5],
@@ -268,96 +428,141 @@ Only group titles about the same specific event/announcement."""
             }
     
     def add_content_to_top_stories(self, curated: Dict):
-        """Scrape content for top stories only"""
-        for category, data in curated.items():
-            for story in data['top_stories']:
-                if self.use_llm:
-                    # Only scrape if we're going to use LLM for enhancement
-                    content = self.scrape_content(story['url'])
-                    if content:
-                        # Store scraped content and generate enhanced summary
-                        story['scraped_content'] = content
+        """Scrape content for top stories only.
+        
+        Runs as a two-stage pipeline: a scraping pool (rate limited per domain) feeds a
+        bounded queue that LLM enhancement workers consume, so HTTP and LLM latency overlap.
+        Results are written back into the story dicts in place.
+        """
+        jobs = [(category, story) for category, data in curated.items() for story in data['top_stories']]
+        
+        if not self.use_llm:
+            for _, story in jobs:
+                print(f"⚡ Skipping content scraping for: {story['title'][:50]}...")
+            return
+        
+        if not jobs:
+            return
+        
+        # Bounded queue gives backpressure: scrapers pause if enhancement falls behind
+        scraped = queue.Queue(maxsize=self.enhance_queue_size)
+        enhance_workers = min(self.max_llm_workers, len(jobs))
+        
+        @in_current_span
+        def scrape_one(category: str, story: Dict):
+            content = None
+            with span(story['url'], 'scrape', category=category) as scrape_span:
+                try:
+                    # Cached URLs skip the per-domain wait entirely
+                    content = self.content_cache.get(story['url']) if self.content_cache else None
+                    scrape_span.set(cached=content is not None)
+                    if content is None:
+                        host = self.scrape_limiter.acquire(story['url'])
+                        try:
+                            content = self._scrape_and_cache(story['url'])
+                        finally:
+                            self.scrape_limiter.release(host)
+                except Exception as e:
+                    logger.warning(f"Scrape stage failed for {story.get('url')}: {e}")
+                scrape_span.set(chars=len(content or ''))
+            scraped.put((category, story, content))
+        
+        @in_current_span
+        def enhance_loop():
+            while True:
+                item = scraped.get()
+                if item is None:
+                    return
+                category, story, content = item
+                if not content:
+                    continue
+                try:
+                    # Store scraped content and generate enhanced summary
+                    story['scraped_content'] = content
+                    with span(story['url'], 'enhance', category=category):
                         enhanced = self.enhance_summary(story['title'], content, category)
-                        if enhanced:
-                            story['enhanced_summary'] = enhanced['summary']
-                            story['why_matters'] = enhanced['why_matters']
-                    time.sleep(1)  # Be nice to servers
-                else:
-                    print(f"⚡ Skipping content scraping for: {story['title'][:50]}...")
+                    if enhanced:
+                        story['enhanced_summary'] = enhanced['summary']
+                        story['why_matters'] = enhanced['why_matters']
+                except Exception as e:
+                    logger.warning(f"Enhance stage failed for {story.get('url')}: {e}")
+        
+        consumers = [threading.Thread(target=enhance_loop, daemon=True) for _ in range(enhance_workers)]
+        for consumer in consumers:
+            consumer.start()
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_scrape_workers, len(jobs))) as executor:
+            futures = [(story, executor.submit(scrape_one, category, story)) for category, story in jobs]
+            for story, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Scrape worker failed for {story.get('url')}: {e}")
+        
+        # All scrapes are queued - tell each consumer to stop once the queue drains
+        for _ in consumers:
+            scraped.put(None)
+        for consumer in consumers:
+            consumer.join()
+        
+        if self.content_cache:
+            self.content_cache.evict_expired()
     
     def scrape_content(self, url: str) -> Optional[str]:
-        """Simple content scraper with debugging"""
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            print(f"Scraping: {url}")
-            
-            # Try common content selectors
-            for selector in ['article', '.article-content', '.post-content', '.story-body']:
-                element = soup.select_one(selector)
-                if element:
-                    text = element.get_text(separator=' ', strip=True)
-                    print(f"Found content with selector '{selector}': {len(text)} chars")
-                    return self.optimize_content_for_llm(text, url) if text else None
-            
-            # Fallback: all paragraphs
-            paragraphs = soup.find_all('p')
-            text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            print(f"Fallback paragraphs: {len(text)} chars")
-            
-            if not text:
-                print("No content found - checking page structure...")
-                print(f"Page title: {soup.title.string if soup.title else 'No title'}")
-                # Print first few divs to see structure
-                divs = soup.find_all('div')[:5]
-                for i, div in enumerate(divs):
-                    if div.get('class'):
-                        print(f"Div {i}: class={div.get('class')}")
-            
-            return self.optimize_content_for_llm(text, url) if text else None
-            
-        except Exception as e:
-            print(f"Scraping error for {url}: {e}")
+        """Return optimized article text, from the content cache when this URL was scraped recently"""
+        if self.content_cache:
+            cached = self.content_cache.get(url)
+            if cached is not None:
+                print(f"Content cache hit: {url}")
+                return cached
+        
+        return self._scrape_and_cache(url)
+    
+    def _scrape_and_cache(self, url: str) -> Optional[str]:
+        """Scrape a URL already known to be uncached and store the result"""
+        content = self.scrape_content_uncached(url)
+        if content and self.content_cache:
+            self.content_cache.put(url, content)
+        return content
+    
+    def scrape_content_uncached(self, url: str) -> Optional[str]:
+        """Scrape and optimize article text via the shared extraction engine"""
+        print(f"Scraping: {url}")
+        result = self.extractor.extract(url)
+        current_span().set(bytes=result['bytes'], **result['timings'])
+        
+        if not result['text']:
+            print(f"No content found for {url}")
             return None
+        
+        timings = result['timings']
+        print(f"Found content with selector '{result['selector']}': {len(result['text'])} chars "
+              f"(fetch {timings['fetch_ms']:.0f}ms, parse {timings['parse_ms']:.0f}ms, select {timings['select_ms']:.0f}ms)")
+        return self.optimize_content_for_llm(result['text'], url)
 
     def optimize_content_for_llm(self, raw_content: str, url: str) -> str:
         """Clean and optimize scraped content for LLM processing"""
         original_length = len(raw_content)
         
-        # Step 1: Remove common junk patterns
-        junk_patterns = [
-            r'subscribe\s+to\s+our\s+newsletter',
-            r'follow\s+us\s+on\s+social\s+media', 
-            r'advertisement\s*:?',
-            r'related\s+articles?:?',
-            r'more\s+from\s+\w+:?',
-            r'read\s+more\s+about',
-            r'sign\s+up\s+for',
-            r'cookies?\s+policy',
-            r'terms\s+of\s+service',
-            r'privacy\s+policy',
-            r'share\s+this\s+article',
-            r'\bshare\b.*\bfacebook\b.*\btwitter\b',
-            r'loading\.\.\.?',
-        ]
-        
-        cleaned = raw_content
+        # Step 1: Remove common junk patterns in one pass, recording what was dropped
         removed_patterns = []
         
-        for pattern in junk_patterns:
-            matches = re.findall(pattern, cleaned, flags=re.IGNORECASE)
-            if matches:
-                removed_patterns.extend(matches)
-                cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        def drop(match):
+            removed_patterns.append(match.group(0))
+            return ''
         
-        # Step 2: Remove excessive whitespace
-        cleaned = ' '.join(cleaned.split())
+        junk_re = junk_regex_for(raw_content)
+        cleaned = junk_re.sub(drop, raw_content) if junk_re else raw_content
         
-        # Step 3: Smart sentence selection (first 8 complete sentences)
-        sentences = [s.strip() + '.' for s in cleaned.split('.') if len(s.strip()) > 20]
-        optimized = ' '.join(sentences[:8])
+        # Steps 2-3: Collapse whitespace per sentence and stop after the first 8 complete sentences
+        sentences = []
+        more_sentences = False
+        for sentence in iter_sentences(cleaned):
+            if len(sentences) == MAX_SENTENCES:
+                more_sentences = True
+                break
+            sentences.append(sentence)
+        optimized = ' '.join(sentences)
         
         # Debug output
         final_length = len(optimized)
@@ -371,8 +576,8 @@ Only group titles about the same specific event/announcement."""
             unique_removed = list(set([p.lower() for p in removed_patterns]))
             print(f"   Removed junk: {', '.join(unique_removed[:3])}{'...' if len(unique_removed) > 3 else ''}")
         
-        if len(sentences) > 8:
-            print(f"   Sentences: kept {len(sentences[:8])}/{len(sentences)} best sentences")
+        if more_sentences:
+            print(f"   Sentences: kept first {len(sentences)} sentences")
         
         return optimized
         
@@ -400,7 +605,7 @@ Summary: [your summary here]
 Why it matters: [your analysis here]"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.generate_content(prompt)
             result = response.text.strip()
             print(f"   LLM output length: {len(result)} chars")
             
@@ -415,6 +620,11 @@ Why it matters: [your analysis here]"""
                 elif line.strip().lower().startswith('why it matters:'):
                     why_matters = line.split(':', 1)[1].strip()
             
+            if not summary and not why_matters:
+                print("   LLM output had no Summary / Why it matters labels")
+                self.discard_cached_response(prompt)
+                return None
+            
             # Return structured data
             return {
                 'summary': summary,
@@ -0,0 +1,25 @@
+from functools import cached_property
+from typing import Dict
+from foreign_exchange_data import get_fx_changes_from_daily_data, get_dxy_from_market_data
+from market_data import get_market_changes_from_daily_data
+
+
+class DataSnapshot:
+    """
+    Market and FX data for a single newsletter render.
+
+    Each dataset is loaded and derived on first access, then shared by every box
+    renderer, so one page build reads and processes each data file exactly once.
+    """
+
+    @cached_property
+    def fx(self) -> Dict:
+        return get_fx_changes_from_daily_data()
+
+    @cached_property
+    def market(self) -> Dict:
+        return get_market_changes_from_daily_data()
+
+    @cached_property
+    def dxy(self) -> Dict:
+        return get_dxy_from_market_data(self.market)
@@ -0,0 +1,99 @@
+import os
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local storage file
+FEED_CACHE_FILE = 'data/cache/feed_cache.json'
+
+
+class FeedCache:
+    """
+    Persistent HTTP validator cache for RSS feeds.
+
+    Stores the ETag / Last-Modified headers returned for each feed URL together with
+    the articles parsed from that response, so an unchanged feed (HTTP 304) can be
+    served from disk without re-downloading or re-parsing it.
+    """
+
+    def __init__(self, cache_path: str = FEED_CACHE_FILE):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = self._load()
+
+    def _load(self) -> Dict:
+        """Load cache file, returning an empty cache if missing or unreadable"""
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('feeds', {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feed cache {self.cache_path}: {e}")
+            return {}
+
+    def conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a feed URL"""
+        with self._lock:
+            entry = self.entries.get(feed_url)
+
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get_articles(self, feed_url: str) -> Optional[List[Dict]]:
+        """Return cached articles for a feed URL, or None if not cached"""
+        with self._lock:
+            entry = self.entries.get(feed_url)
+        if entry is None:
+            return None
+        return [dict(article) for article in entry.get('articles', [])]
+
+    def store(self, feed_url: str, response_headers, articles: List[Dict]):
+        """Record validators and parsed articles from a 200 response"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+
+        # Nothing to revalidate against next time - don't bother caching
+        if not etag and not last_modified:
+            with self._lock:
+                if self.entries.pop(feed_url, None) is not None:
+                    self._dirty = True
+            return
+
+        with self._lock:
+            self.entries[feed_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'cached_at': datetime.now(timezone.utc).isoformat(),
+                'articles': articles
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write cache to disk if anything changed this run"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {'feeds': self.entries}
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            logger.info(f"Saved feed cache for {len(payload['feeds'])} feeds to {self.cache_path}")
+        except Exception as e:
+            logger.error(f"Error saving feed cache: {e}")
@@ -1,15 +1,26 @@
 import os
+import sys
 import requests
 import json
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
-def get_dxy_from_market_data() -> Dict:
-    """Get DXY data from market data system"""
+sys.path.append(os.getcwd())
+
+from src.mvp_news_aggregator.rate_limit import TokenBucket
+from src.mvp_news_aggregator.timeseries import DEFAULT_PERIODS, load_columnar
+from src.mvp_news_aggregator.tracing import in_current_span, span
+
+def get_dxy_from_market_data(market_data: Optional[Dict] = None) -> Dict:
+    """Get DXY data from market data system (pass already-processed market data to skip reloading it)"""
     try:
-        from market_data import get_market_changes_from_daily_data
-        market_data = get_market_changes_from_daily_data()
+        if market_data is None:
+            from market_data import get_market_changes_from_daily_data
+            market_data = get_market_changes_from_daily_data()
         
         if market_data.get('status') == 'success' and market_data.get('prices'):
             prices = market_data['prices']
@@ -27,6 +38,14 @@ def get_dxy_from_market_data() -> Dict:
 # Local storage files
 DAILY_DATA_FILE = 'data/loading/fx_data.json'
 
+FX_PAIRS = ['NZD/USD', 'NZD/AUD', 'NZD/INR', 'NZD/CNY', 'NZD/THB'] # , 'USD/BTC']
+
+# Responses worth retrying - rate limited or a temporary server problem
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Fetches a synthetic day gets (the first included) before its filled-in rates are kept for good
+SYNTHETIC_MAX_ATTEMPTS = 3
+
 def _ensure_data_directory():
     """Ensure data/loading directory exists"""
     os.makedirs('data/loading', exist_ok=True)
@@ -100,18 +119,18 @@ def _fetch_historical_rates_alternative(date, current_rates) -> Dict:
     days_ago = (datetime.now().date() - date).days
     
     # Apply realistic variations based on days ago
-    import random
-    random.seed(int(date.strftime('%Y%m%d')))  # Consistent seed for date
+    # Own generator per call: consistent seed for date, and safe across backfill threads
+    rng = random.Random(int(date.strftime('%Y%m%d')))
     
     for pair, current_rate in current_rates.items():
         if pair == 'USD/BTC':
             # Crypto is more volatile
-            variation = random.uniform(-0.05, 0.05)  # ±5%
+            variation = rng.uniform(-0.05, 0.05)  # ±5%
             varied_rate = current_rate * (1 + variation)
             rates[pair] = round(varied_rate, 0)
         else:
             # Traditional FX is less volatile
-            variation = random.uniform(-0.02, 0.02)  # ±2%
+            variation = rng.uniform(-0.02, 0.02)  # ±2%
             varied_rate = current_rate * (1 + variation)
             if pair in ['NZD/INR', 'NZD/THB']:
                 rates[pair] = round(varied_rate, 2)
@@ -120,32 +139,58 @@ def _fetch_historical_rates_alternative(date, current_rates) -> Dict:
     
     return rates
 
-def _try_exchangerate_api(date) -> Dict:
-    """Try exchangerate-api.com for historical data"""
-    try:
-        date_str = date.strftime('%Y-%m-%d')
-        url = f"https://api.exchangerate-api.com/v4/history/NZD/{date_str}"
-        response = requests.get(url, timeout=10)
+def _parse_exchangerate_rates(data: Dict) -> Dict:
+    """Pull our NZD pairs out of an exchangerate-api response"""
+    rates = {}
+    
+    if 'rates' in data:
+        if 'USD' in data['rates']:
+            rates['NZD/USD'] = round(data['rates']['USD'], 4)
+        if 'AUD' in data['rates']:
+            rates['NZD/AUD'] = round(data['rates']['AUD'], 4)
+        if 'INR' in data['rates']:
+            rates['NZD/INR'] = round(data['rates']['INR'], 2)
+        if 'CNY' in data['rates']:
+            rates['NZD/CNY'] = round(data['rates']['CNY'], 4)
+        if 'THB' in data['rates']:
+            rates['NZD/THB'] = round(data['rates']['THB'], 2)
+    
+    return rates
+
+def _try_exchangerate_api(date, limiter: Optional[TokenBucket] = None,
+                          max_retries: int = 0, backoff: float = 0.5) -> Dict:
+    """
+    Try exchangerate-api.com for historical data.
+    
+    Transient failures (timeouts, connection errors, 429/5xx) are retried up to
+    max_retries times with exponential backoff and jitter, honouring Retry-After.
+    Every attempt takes a token from `limiter` when one is given.
+    """
+    date_str = date.strftime('%Y-%m-%d')
+    url = f"https://api.exchangerate-api.com/v4/history/NZD/{date_str}"
+    
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire()
         
-        if response.status_code == 200:
-            data = response.json()
-            rates = {}
-            
-            if 'rates' in data:
-                if 'USD' in data['rates']:
-                    rates['NZD/USD'] = round(data['rates']['USD'], 4)
-                if 'AUD' in data['rates']:
-                    rates['NZD/AUD'] = round(data['rates']['AUD'], 4)
-                if 'INR' in data['rates']:
-                    rates['NZD/INR'] = round(data['rates']['INR'], 2)
-                if 'CNY' in data['rates']:
-                    rates['NZD/CNY'] = round(data['rates']['CNY'], 4)
-                if 'THB' in data['rates']:
-                    rates['NZD/THB'] = round(data['rates']['THB'], 2)
-            
-            return rates
-    except:
-        pass
+        retry_after = None
+        try:
+            response = requests.get(url, timeout=10)
+            if response.status_code == 200:
+                return _parse_exchangerate_rates(response.json())
+            if response.status_code not in TRANSIENT_STATUS_CODES:
+                return {}
+            retry_after = response.headers.get('Retry-After')
+        except (requests.ConnectionError, requests.Timeout):
+            pass
+        except Exception:
+            return {}
+        
+        if attempt < max_retries:
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            time.sleep(delay)
     
     return {}
 
@@ -167,104 +212,186 @@ def _try_coingecko_historical(date) -> Dict:
     
     return {}
 
-def fetch_daily_fx_data_past_month() -> Dict:
-    """Fetch daily FX data for past month and save to data/loading/fx_data.json"""
+def _fetch_rates_for_date(date, current_rates: Dict, limiter: Optional[TokenBucket] = None,
+                          max_retries: int = 0) -> Dict:
+    """
+    Fetch one day's rates, filling any missing pairs with variations of current rates.
+    
+    Days that needed any filled-in pair are marked 'synthetic' so the store refetches them later.
+    """
+    daily_rates = {}
+    
+    # Try real historical APIs first
+    traditional_data = _try_exchangerate_api(date, limiter=limiter, max_retries=max_retries)
+    # crypto_data = _try_coingecko_historical(date)
+    
+    if traditional_data:
+        daily_rates.update(traditional_data)
+    
+    # if crypto_data:
+    #     daily_rates.update(crypto_data)
+    
+    # If we got some but not all data, fill in with variations
+    if not daily_rates and current_rates:
+        daily_rates = _fetch_historical_rates_alternative(date, current_rates)
+    elif len(daily_rates) < len(FX_PAIRS) and current_rates:  # Fill missing pairs
+        alternative_data = _fetch_historical_rates_alternative(date, current_rates)
+        for pair in FX_PAIRS:
+            if pair not in daily_rates and pair in alternative_data:
+                daily_rates[pair] = alternative_data[pair]
+    
+    if len(daily_rates) > len(traditional_data):
+        daily_rates['synthetic'] = True
+    
+    return daily_rates
+
+def load_fx_store() -> Dict:
+    """Load the FX time-series store (fx_data.json), or an empty one"""
+    try:
+        with open(DAILY_DATA_FILE, 'r') as f:
+            store = json.load(f)
+        store.setdefault('daily_rates', {})
+        return store
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'metadata': {}, 'daily_rates': {}}
+
+def save_fx_store(store: Dict):
+    """Write the FX store atomically with dates in order"""
+    _ensure_data_directory()
+    store['daily_rates'] = dict(sorted(store['daily_rates'].items()))
+    
+    tmp_file = f"{DAILY_DATA_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(store, f, indent=2)
+    os.replace(tmp_file, DAILY_DATA_FILE)
+
+def _missing_dates(daily_rates: Dict, start_date, end_date) -> List:
+    """Dates in [start_date, end_date] with no stored rates, or synthetic ones still worth retrying"""
+    missing = []
+    current_date = start_date
+    while current_date <= end_date:
+        rates = daily_rates.get(current_date.isoformat())
+        if not rates or (rates.get('synthetic') and rates.get('attempts', 1) < SYNTHETIC_MAX_ATTEMPTS):
+            missing.append(current_date)
+        current_date += timedelta(days=1)
+    return missing
+
+def _fill_missing_dates(daily_rates: Dict, missing: List, current_rates: Dict,
+                        max_workers: int, requests_per_second: float, max_retries: int) -> int:
+    """
+    Fetch missing dates concurrently under a shared token bucket.
+    
+    Results are merged into daily_rates in date order once all fetches finish. A stored
+    synthetic day is only replaced by real rates, so its values don't drift between runs;
+    otherwise its attempt count goes up. Returns the number of dates filled.
+    """
+    if not missing:
+        return 0
+    
+    limiter = TokenBucket(rate=requests_per_second, capacity=max_workers)
+    
+    @in_current_span
+    def fetch(date):
+        with span(date.isoformat(), 'http') as day_span:
+            rates = _fetch_rates_for_date(date, current_rates, limiter=limiter, max_retries=max_retries)
+            day_span.set(items=len(rates or {}))
+            return rates
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        results = list(executor.map(fetch, missing))
+    
+    filled = 0
+    for date, rates in zip(missing, results):
+        stored = daily_rates.get(date.isoformat())
+        if stored and stored.get('synthetic') and (not rates or rates.get('synthetic')):
+            stored['attempts'] = stored.get('attempts', 1) + 1
+        elif rates:
+            if rates.get('synthetic'):
+                rates['attempts'] = 1
+            daily_rates[date.isoformat()] = rates
+            filled += 1
+    return filled
+
+def fetch_daily_fx_data_past_month(days: int = 30,
+                                   max_workers: int = 8,
+                                   requests_per_second: float = 10,
+                                   max_retries: int = 3) -> Dict:
+    """
+    Bring data/loading/fx_data.json up to date for the past `days` days.
+    
+    Past days never change, so the file is treated as an append-only store: only
+    dates it doesn't already hold are fetched, and today is refreshed from the
+    current rates. A routine run makes one request instead of one per day; a
+    first run or a long backfill fetches the gaps concurrently (see backfill_fx_history).
+    
+    Days that only got synthetic rates are retried on later runs, up to
+    SYNTHETIC_MAX_ATTEMPTS fetches in all, so an endpoint that keeps returning nothing
+    costs a few extra requests per run rather than one per day in the window.
+    """
     _ensure_data_directory()
     
     end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=30)
+    start_date = end_date - timedelta(days=days)
+    
+    store = load_fx_store()
+    daily_rates = store['daily_rates']
     
     # Get current rates as baseline
     print("Fetching current rates as baseline...")
     current_rates = _fetch_current_rates()
     print(f"Current rates: {current_rates}")
     
-    result = {
-        'metadata': {
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
-            'currency_pairs': ['NZD/USD', 'NZD/AUD', 'NZD/INR', 'NZD/CNY', 'NZD/THB'], # , 'USD/BTC'],
-            'fetch_timestamp': datetime.now().isoformat(),
-            'note': 'Historical data with fallback to realistic variations of current rates'
-        },
-        'daily_rates': {}
-    }
+    # Past days we don't have yet (today is handled below)
+    missing = _missing_dates(daily_rates, start_date, end_date - timedelta(days=1))
+    print(f"FX store has {len(daily_rates)} days; fetching {len(missing)} missing days between {start_date} and {end_date}")
     
-    print(f"Fetching daily FX data from {start_date} to {end_date}")
+    fetch_start = time.time()
+    successful_fetches = _fill_missing_dates(daily_rates, missing, current_rates,
+                                             max_workers, requests_per_second, max_retries)
+    if missing:
+        print(f"Fetched {len(missing)} days in {time.time() - fetch_start:.1f}s")
     
-    current_date = start_date
-    successful_fetches = 0
+    # Today's rate moves during the day - always refresh it
+    today_rates = dict(current_rates) if current_rates else _fetch_rates_for_date(end_date, current_rates)
+    if today_rates:
+        daily_rates[end_date.isoformat()] = today_rates
     
-    while current_date <= end_date:
-        date_str = current_date.isoformat()
-        print(f"Processing {date_str}...")
-        
-        daily_rates = {}
-        
-        # Try real historical APIs first
-        traditional_data = _try_exchangerate_api(current_date)
-        # crypto_data = _try_coingecko_historical(current_date)
-        
-        if traditional_data:
-            daily_rates.update(traditional_data)
-        
-        # if crypto_data:
-        #     daily_rates.update(crypto_data)
-        
-        # If we got some but not all data, fill in with variations
-        if not daily_rates and current_rates:
-            daily_rates = _fetch_historical_rates_alternative(current_date, current_rates)
-        elif len(daily_rates) < 5 and current_rates:  # Fill missing pairs (5 traditional FX pairs)
-            alternative_data = _fetch_historical_rates_alternative(current_date, current_rates)
-            for pair in ['NZD/USD', 'NZD/AUD', 'NZD/INR', 'NZD/CNY', 'NZD/THB']: # , 'USD/BTC']:
-                if pair not in daily_rates and pair in alternative_data:
-                    daily_rates[pair] = alternative_data[pair]
-        
-        result['daily_rates'][date_str] = daily_rates
-        
-        if daily_rates:
-            successful_fetches += 1
-        
-        current_date += timedelta(days=1)
-        time.sleep(0.2)  # Increased delay to be more respectful
+    dates = sorted(daily_rates.keys())
+    store['metadata'] = {
+        'start_date': dates[0] if dates else start_date.isoformat(),
+        'end_date': dates[-1] if dates else end_date.isoformat(),
+        'currency_pairs': FX_PAIRS,
+        'fetch_timestamp': datetime.now().isoformat(),
+        'note': 'Historical data with fallback to realistic variations of current rates'
+    }
     
     # Save to file
-    output_file = 'data/loading/fx_data.json'
     try:
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
-        print(f"Daily FX data saved to {output_file}")
-        print(f"Successfully processed {successful_fetches}/{len(result['daily_rates'])} dates")
+        save_fx_store(store)
+        print(f"Daily FX data saved to {DAILY_DATA_FILE}")
+        print(f"Successfully filled {successful_fetches}/{len(missing)} missing dates")
         
     except Exception as e:
         print(f"Error saving data: {e}")
     
-    return result
+    return store
+
+def backfill_fx_history(days: int = 365, max_workers: int = 16, requests_per_second: float = 20) -> Dict:
+    """Backfill a long FX history (e.g. a year for longer-horizon changes) with a wider worker pool"""
+    return fetch_daily_fx_data_past_month(days=days, max_workers=max_workers,
+                                          requests_per_second=requests_per_second)
 
 def get_fx_changes_from_daily_data() -> Dict:
     """Calculate current rates and changes from daily data"""
     try:
-        with open(DAILY_DATA_FILE, 'r') as f:
-            daily_data = json.load(f)
-        
-        daily_rates = daily_data.get('daily_rates', {})
-        if not daily_rates:
+        frame = load_columnar(DAILY_DATA_FILE, 'daily_rates', columns=FX_PAIRS)
+        if frame is None or not len(frame):
             return {}
         
-        # Get dates for comparison
-        dates = sorted(daily_rates.keys())
-        today = dates[-1]  # Most recent date
-        
-        # Find comparison dates (1, 7, 30 days ago)
-        today_idx = len(dates) - 1
-        day_1_idx = max(0, today_idx - 1)
-        day_7_idx = max(0, today_idx - 7)
-        day_30_idx = max(0, today_idx - 30)
-        
-        current_rates = daily_rates[dates[today_idx]]
-        rates_1d = daily_rates[dates[day_1_idx]] if day_1_idx < today_idx else {}
-        rates_7d = daily_rates[dates[day_7_idx]] if day_7_idx < today_idx else {}
-        rates_30d = daily_rates[dates[day_30_idx]] if day_30_idx < today_idx else {}
+        # Compare against the latest stored date on or before 1, 7 and 30 calendar days
+        # ago, since the store can hold more than a month or have gaps
+        changes = frame.changes_by_column(DEFAULT_PERIODS, calendar_days=True)
+        current_row = frame.values[-1]
         
         # Calculate changes
         fx_data = {
@@ -273,27 +400,12 @@ def get_fx_changes_from_daily_data() -> Dict:
             'status': 'success'
         }
         
-        for pair in ['NZD/USD', 'NZD/AUD', 'NZD/INR', 'NZD/CNY', 'NZD/THB']: # , 'USD/BTC']:
-            if pair in current_rates:
-                current = current_rates[pair]
-                
+        for j, pair in enumerate(frame.columns):
+            if not np.isnan(current_row[j]):
                 fx_data['rates'][pair] = {
-                    'current': current,
-                    'changes': {}
+                    'current': float(current_row[j]),
+                    'changes': changes[pair]
                 }
-                
-                # Calculate percentage changes
-                if pair in rates_1d and rates_1d[pair]:
-                    change_1d = _calculate_percentage_change(current, rates_1d[pair])
-                    fx_data['rates'][pair]['changes']['24h'] = change_1d
-                
-                if pair in rates_7d and rates_7d[pair]:
-                    change_7d = _calculate_percentage_change(current, rates_7d[pair])
-                    fx_data['rates'][pair]['changes']['7d'] = change_7d
-                
-                if pair in rates_30d and rates_30d[pair]:
-                    change_30d = _calculate_percentage_change(current, rates_30d[pair])
-                    fx_data['rates'][pair]['changes']['30d'] = change_30d
         
         return fx_data
         
@@ -316,6 +428,15 @@ def pull_fx_data() -> Dict:
         print(f"Error processing FX data: {fx_data.get('error')}")
         return {'status': 'error', 'error': 'Failed to process FX data'}
 
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Update the local FX history store")
+    parser.add_argument('--backfill', type=int, metavar='DAYS', help="Backfill this many days of history")
+    args = parser.parse_args()
+    
+    if args.backfill:
+        backfill_fx_history(days=args.backfill)
+
 # if __name__ == "__main__":
 #     # Fetch daily data
 #     print("Fetching daily FX data...")
@@ -0,0 +1,92 @@
+import os
+import json
+import hashlib
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local storage file - the last rendered fragment of each page section
+FRAGMENT_CACHE_FILE = 'data/cache/page_fragments.json'
+
+
+def input_hash(*inputs) -> str:
+    """SHA-256 of JSON-serialisable section inputs (dict key order doesn't matter)"""
+    payload = json.dumps(inputs, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def source_fingerprint(*paths: str) -> str:
+    """Hash of the renderer source files, so editing a template invalidates every fragment"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class FragmentCache:
+    """
+    Rendered page sections, keyed by a hash of each section's own input data.
+
+    Only the latest fragment per section is kept (persisted between runs), so a rebuild
+    re-renders just the sections whose inputs changed and reuses the rest. Values that
+    change on every build without affecting the section's layout, like "last updated"
+    timestamps, are passed as `holes`: the fragment is rendered with a marker in their
+    place and the current value is spliced in each time it is used.
+    """
+
+    def __init__(self, path: str = FRAGMENT_CACHE_FILE, version: str = ''):
+        self.path = path
+        self.version = version
+        self.entries = self._load()
+        self.rebuilt = []
+        self.reused = []
+        self._dirty = False
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def render(self, section: str, inputs, render: Callable[[Callable[[str], object], Dict], None],
+               holes: Optional[Dict[str, str]] = None) -> str:
+        """
+        Return the section's HTML, calling render(write, markers) only on a cache miss.
+
+        `markers` maps each hole name to the placeholder the renderer should write instead
+        of the real value.
+        """
+        holes = holes or {}
+        markers = {name: f"\x00{name}\x00" for name in holes}
+        key = input_hash(self.version, section, inputs)
+
+        entry = self.entries.get(section)
+        if entry and entry.get('key') == key:
+            fragment = entry['html']
+            self.reused.append(section)
+        else:
+            buffer = []
+            render(buffer.append, markers)
+            fragment = ''.join(buffer)
+            self.entries[section] = {'key': key, 'html': fragment}
+            self._dirty = True
+            self.rebuilt.append(section)
+
+        for name, value in holes.items():
+            fragment = fragment.replace(markers[name], str(value))
+        return fragment
+
+    def save(self):
+        """Persist the fragments atomically (only if any section was re-rendered)"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        logger.debug(f"Saved {len(self.entries)} page fragments to {self.path}")
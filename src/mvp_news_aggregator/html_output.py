@@ -0,0 +1,80 @@
+import re
+import gzip
+from typing import Dict
+import logging
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content inside these is whitespace-sensitive (or not HTML) and gets its own treatment
+_RAW_BLOCK_RE = re.compile(r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+# HTML whitespace only - \s would also swallow non-breaking spaces, which do render
+_WHITESPACE_RE = re.compile(r'[ \t\n\r\f]+')
+_PLACEHOLDER_RE = re.compile(r'\x00(\d+)\x00')
+
+# Whitespace next to these tags never renders, so it can go entirely
+_BLOCK_TAGS = ('html|head|body|title|meta|link|style|script|div|p|h[1-6]|ul|ol|li|table|thead|tbody|tr|td|th|'
+               'header|footer|section|article|nav|aside|main|form|hr|br|!doctype')
+_BEFORE_BLOCK_TAG_RE = re.compile(rf' (?=</?(?:{_BLOCK_TAGS})\b)', re.IGNORECASE)
+_AFTER_BLOCK_TAG_RE = re.compile(rf'(</?(?:{_BLOCK_TAGS})\b[^<>]*>) ', re.IGNORECASE)
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_PUNCTUATION_RE = re.compile(r' ?([{};,>]) ?')
+
+# Precompressed sibling suffixes: every one we know about, and those this install can produce
+ALL_COMPRESSED_SUFFIXES = ('.gz', '.br')
+COMPRESSED_SUFFIXES = ('.gz', '.br') if brotli else ('.gz',)
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and collapse whitespace around CSS punctuation"""
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _WHITESPACE_RE.sub(' ', css)
+    css = _CSS_PUNCTUATION_RE.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def _strip_indentation(code: str) -> str:
+    """Remove leading indentation and blank lines - safe for JS, unlike joining lines"""
+    return '\n'.join(line.strip() for line in code.splitlines() if line.strip())
+
+
+def minify_html(html: str) -> str:
+    """
+    Collapse the template indentation out of a page without changing how it renders.
+
+    Whitespace runs become a single space, and disappear entirely next to block-level
+    tags where they can't render. <pre>/<textarea> are left alone, inline <style> is
+    CSS-minified and inline <script> only loses its indentation.
+    """
+    raw_bodies = []
+
+    def stash(match) -> str:
+        tag, body = match.group(2).lower(), match.group(3)
+        if tag == 'style':
+            body = minify_css(body)
+        elif tag == 'script':
+            body = _strip_indentation(body)
+        raw_bodies.append(body)
+        # Keep the tags in the markup so the block-tag rules still see them
+        return f"{match.group(1)}\x00{len(raw_bodies) - 1}\x00{match.group(4)}"
+
+    html = _RAW_BLOCK_RE.sub(stash, html)
+    html = _COMMENT_RE.sub('', html)
+    html = _WHITESPACE_RE.sub(' ', html)
+    html = _AFTER_BLOCK_TAG_RE.sub(r'\1', html)
+    html = _BEFORE_BLOCK_TAG_RE.sub('', html)
+    return _PLACEHOLDER_RE.sub(lambda match: raw_bodies[int(match.group(1))], html).strip()
+
+
+def compressed_variants(data: bytes) -> Dict[str, bytes]:
+    """gzip (and brotli when installed) encodings of data, keyed by file suffix"""
+    # mtime=0 keeps the gzip bytes deterministic, so unchanged pages produce identical files
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional
+import logging
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+sys.path.append(os.getcwd())
+
+from src.mvp_news_aggregator.llm_cache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+# Which backend create_model() builds: 'gemini' (default) or 'fake' for a local stand-in
+LLM_BACKEND_ENV = 'LLM_BACKEND'
+
+# Fake backend settings, read by FakeLLMBackend.from_env()
+FAKE_LLM_LATENCY_ENV = 'FAKE_LLM_LATENCY'                # e.g. "0.8", "uniform:0.3:2", "lognormal:0.8:0.5"
+FAKE_LLM_429_RATE_ENV = 'FAKE_LLM_429_RATE'              # chance of any call being rate limited
+FAKE_LLM_RPM_ENV = 'FAKE_LLM_RPM'                        # per-minute quota; calls beyond it get a 429
+FAKE_LLM_MALFORMED_RATE_ENV = 'FAKE_LLM_MALFORMED_RATE'  # chance of a response that doesn't parse
+FAKE_LLM_SEED_ENV = 'FAKE_LLM_SEED'
+
+
+class ModelBackend(ABC):
+    """
+    Interface for the text model behind ArticleCurator and QuizGenerator.
+
+    A backend only needs generate_content(prompt) returning an object with `.text`, and
+    raising on failure the way the Gemini client does (429s as ResourceExhausted).
+    `model_name` keys the LLM response cache, so each backend must use its own names.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @abstractmethod
+    def generate_content(self, prompt: str):
+        """Run the prompt and return a response with `.text`"""
+
+
+class GeminiBackend(ModelBackend):
+    """The Gemini API, configured from GEMINI_API_KEY"""
+
+    def __init__(self, model_name: str = 'gemini-2.0-flash'):
+        super().__init__(model_name)
+        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt: str):
+        return self.model.generate_content(prompt)
+
+
+def parse_latency(spec: str):
+    """
+    Latency distribution from a spec string, as a function of a random.Random:
+    "0.8" or "fixed:0.8", "uniform:<low>:<high>", "lognormal:<median>:<sigma>" (seconds)
+    """
+    kind, _, params = spec.partition(':') if ':' in spec else ('fixed', '', spec)
+    try:
+        values = [float(value) for value in params.split(':') if value]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'lognormal' and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+class FakeLLMBackend(ModelBackend):
+    """
+    Local Gemini stand-in for load-testing the LLM paths without an API key.
+
+    Recognises the curation, duplicate-check, enhancement and quiz prompts and answers
+    each with output in the schema the pipeline parses; the same prompt always gets the
+    same answer. On top of that it can simulate a real API: sampled latency, 429s (at
+    random, or past a per-minute quota) and a share of malformed responses. Injected
+    failures are random but reproducible with a seed.
+    """
+
+    def __init__(self, model_name: str = 'gemini-2.0-flash', latency: str = '0',
+                 rate_limit_rate: float = 0.0, requests_per_minute: int = 0,
+                 malformed_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(f"fake-{model_name}")
+        self.latency = parse_latency(latency)
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent_calls = deque()
+        self.stats = {'calls': 0, 'rate_limited': 0, 'malformed': 0}
+
+    @classmethod
+    def from_env(cls, model_name: str = 'gemini-2.0-flash') -> 'FakeLLMBackend':
+        """Fake backend configured from the FAKE_LLM_* environment variables"""
+        seed = os.getenv(FAKE_LLM_SEED_ENV)
+        return cls(model_name,
+                   latency=os.getenv(FAKE_LLM_LATENCY_ENV, '0'),
+                   rate_limit_rate=float(os.getenv(FAKE_LLM_429_RATE_ENV, '0')),
+                   requests_per_minute=int(os.getenv(FAKE_LLM_RPM_ENV, '0')),
+                   malformed_rate=float(os.getenv(FAKE_LLM_MALFORMED_RATE_ENV, '0')),
+                   seed=int(seed) if seed else None)
+
+    def generate_content(self, prompt: str) -> CachedResponse:
+        with self._lock:
+            self.stats['calls'] += 1
+            delay = max(0.0, self.latency(self._rng))
+            rate_limited = self._rng.random() < self.rate_limit_rate or self._over_quota()
+            malformed = not rate_limited and self._rng.random() < self.malformed_rate
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+            if malformed:
+                self.stats['malformed'] += 1
+
+        if rate_limited:
+            # Rejections come back quickly, like the real API's
+            time.sleep(min(delay, 0.05))
+            raise google_exceptions.ResourceExhausted('Resource has been exhausted (injected by fake backend)')
+
+        time.sleep(delay)
+        text = self._answer(prompt)
+        return CachedResponse(self._malform(text) if malformed else text)
+
+    def _over_quota(self) -> bool:
+        """Sliding one-minute window of accepted calls (lock held)"""
+        if not self.requests_per_minute:
+            return False
+        now = time.monotonic()
+        while self._recent_calls and now - self._recent_calls[0] >= 60:
+            self._recent_calls.popleft()
+        if len(self._recent_calls) >= self.requests_per_minute:
+            return True
+        self._recent_calls.append(now)
+        return False
+
+    def _malform(self, text: str) -> str:
+        """Break a response in one of the ways real model output goes wrong"""
+        with self._lock:
+            kind = self._rng.choice(['truncated', 'chatty', 'unlabelled'])
+        if kind == 'truncated':
+            return text[:len(text) // 2]
+        if kind == 'chatty':
+            return f"Sure! Here is what you asked for:\n```json\n{text}\n```"
+        # Plain prose, without the JSON structure or "Summary:" labels the parsers look for
+        return re.sub(r'[{}\[\]":]|Summary|Why it matters', '', text)
+
+    # --- schema-valid answers ---------------------------------------------------------
+
+    def _answer(self, prompt: str) -> str:
+        if prompt.startswith('Find duplicate news stories'):
+            return self._duplicates(prompt)
+        if 'Return JSON:' in prompt and 'Articles: ' in prompt:
+            return self._curate(prompt)
+        if prompt.startswith('Analyze this'):
+            return self._enhance(prompt)
+        quiz = re.search(r'Generate a (\d+)-question quiz', prompt)
+        if quiz:
+            return self._quiz(prompt, int(quiz.group(1)))
+        return '{}'
+
+    @staticmethod
+    def _rank(value) -> int:
+        return int(hashlib.md5(str(value).encode('utf-8')).hexdigest()[:8], 16)
+
+    def _duplicates(self, prompt: str) -> str:
+        """Group the numbered titles that are identical apart from case and punctuation"""
+        groups: Dict[str, List[int]] = {}
+        for number, title in re.findall(r'^(\d+)\. (.*)$', prompt, re.MULTILINE):
+            groups.setdefault(re.sub(r'\W+', ' ', title).strip().lower(), []).append(int(number))
+        return json.dumps({'duplicates': [numbers for numbers in groups.values() if len(numbers) > 1]})
+
+    def _curate(self, prompt: str) -> str:
+        articles = json.loads(prompt[prompt.rindex('Articles: ') + len('Articles: '):])
+        ranked = sorted(articles, key=lambda article: self._rank(article['id']))
+        return json.dumps({
+            'top_stories': [{'id': article['id'], 'score': 9 - i % 5, 'reason': 'Significant development'}
+                            for i, article in enumerate(ranked[:5])],
+            'quick_reads': [{'id': article['id'], 'reason': 'Worth monitoring'} for article in ranked[5:10]],
+        })
+
+    def _enhance(self, prompt: str) -> str:
+        title = re.search(r'Title: (.*)', prompt)
+        title = title.group(1).strip() if title else 'this story'
+        return (f"Summary: {title} was reported today, with the key players confirming details.\n"
+                f"Why it matters: Developments like {title[:60]} shape markets and policy in the months ahead.")
+
+    def _quiz(self, prompt: str, count: int) -> str:
+        topics = re.search(r'Topics: (.*)', prompt)
+        topics = [topic.strip() for topic in topics.group(1).split(',')] if topics else ['general_knowledge']
+        options = ['Alpha', 'Beta', 'Gamma', 'Delta']
+        return json.dumps([{
+            'id': i + 1,
+            'question': f"Which option is correct for {topics[i % len(topics)]} question {i + 1}?",
+            'options': options,
+            'correct_answer': options[self._rank(i) % 4],
+            'category': topics[i % len(topics)],
+            'explanation': 'Generated by the local fake model.'
+        } for i in range(count)])
+
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': FakeLLMBackend.from_env,
+}
+
+
+def create_model(model_name: str = 'gemini-2.0-flash', backend: Optional[str] = None) -> ModelBackend:
+    """Build the configured backend (LLM_BACKEND env var, default 'gemini') for a model name"""
+    backend = backend or os.getenv(LLM_BACKEND_ENV, 'gemini')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}' (expected one of: {', '.join(BACKENDS)})")
+    if backend != 'gemini':
+        logger.info(f"Using '{backend}' LLM backend for {model_name}")
+    return BACKENDS[backend](model_name)
@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Local storage directory
+LLM_CACHE_DIR = 'data/cache/llm'
+
+
+class CachedResponse:
+    """Minimal stand-in for a Gemini response object - exposes .text like the real thing"""
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LLMResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses.
+
+    Entries are keyed by a SHA-256 of the model name plus prompt text (plus an optional
+    extra key component), expire after `ttl_seconds`, and the least recently used entries
+    are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self,
+                 cache_dir: str = LLM_CACHE_DIR,
+                 ttl_seconds: int = 7 * 24 * 3600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # key -> [size_bytes, last_access]; file mtime doubles as last access time on disk
+        self._index: Dict[str, list] = {}
+        self._total_bytes = 0
+        for name in os.listdir(cache_dir):
+            if not name.endswith('.json'):
+                continue
+            stat = os.stat(os.path.join(cache_dir, name))
+            self._index[name[:-5]] = [stat.st_size, stat.st_mtime]
+            self._total_bytes += stat.st_size
+
+    def make_key(self, model_name: str, prompt: str, extra: str = '') -> str:
+        """Hash model name + prompt (+ extra) into a cache key"""
+        digest = hashlib.sha256()
+        for part in (model_name, extra, prompt):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response text, or None on miss/expiry"""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.stats['misses'] += 1
+                return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception:
+            self._remove(key)
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            self._remove(key)
+            with self._lock:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = now
+            self.stats['hits'] += 1
+        return entry['text']
+
+    def put(self, key: str, text: str, model_name: str = ''):
+        """Store response text and evict LRU entries if over the size budget"""
+        payload = json.dumps({'model': model_name, 'created_at': time.time(), 'text': text}, ensure_ascii=False)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write LLM cache entry: {e}")
+            return
+
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._index:
+                self._total_bytes -= self._index[key][0]
+            self._index[key] = [size, time.time()]
+            self._total_bytes += size
+            self.stats['stores'] += 1
+        self._evict()
+
+    def discard(self, key: str):
+        """Drop an entry, e.g. when the cached response turned out to be unusable"""
+        self._remove(key)
+
+    def _remove(self, key: str):
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry:
+                self._total_bytes -= entry[0]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes"""
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            by_age = sorted(self._index.items(), key=lambda item: item[1][1])
+
+        for key, _ in by_age:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    return
+                self.stats['evictions'] += 1
+            self._remove(key)
+
+    def generate(self, model, model_name: str, prompt: str, extra: str = ''):
+        """Return a cached response for (model, prompt), calling model.generate_content on a miss"""
+        key = self.make_key(model_name, prompt, extra)
+        text = self.get(key)
+        if text is not None:
+            return CachedResponse(text)
+
+        response = model.generate_content(prompt)
+        self.put(key, response.text, model_name)
+        return response
+
+    def summary(self) -> str:
+        """One-line hit/miss summary for logging"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / lookups * 100) if lookups else 0.0
+        return (f"LLM cache: {self.stats['hits']} hits / {self.stats['misses']} misses ({hit_rate:.0f}% hit rate), "
+                f"{self.stats['evictions']} evictions, {len(self._index)} entries")
@@ -1,7 +1,12 @@
+import os
+import sys
 import json
 import argparse
 
+sys.path.append(os.getcwd())
+
 from collector import ArticleCollector
+from article_store import ArticleStore
 from sources import RSS_FEEDS
 # from database import NewsletterDB
 # from subscribers import add_subscribers
@@ -12,42 +17,69 @@ from web_newsletter import NewsletterGenerator, generate_newsletter, regenerate_
 from quiz_data import pull_quiz_data
 from foreign_exchange_data import pull_fx_data
 from market_data import pull_market_data
+from src.mvp_news_aggregator.tracing import span, start_trace, stop_trace
 from email_newsletter_sender import send_newsletter, send_test_email, send_simple_test_email, send_simple_newsletter
 
-def run_daily_pipeline(use_llm: bool = True, send_email: bool = False, test_email: str = None): 
-    # 1. Collect articles
-    collector = ArticleCollector(RSS_FEEDS)
-    results = collector.collect_all()
+def run_daily_pipeline(use_llm: bool = True, send_email: bool = False, test_email: str = None, trace: bool = True):
+    """Run the pipeline; with trace on, a Chrome/Perfetto trace of the run is written to data/traces/"""
+    if not trace:
+        return _run_daily_pipeline(use_llm, send_email, test_email)
+    
+    tracer = start_trace()
+    try:
+        with span('run_daily_pipeline', 'pipeline', use_llm=use_llm):
+            return _run_daily_pipeline(use_llm, send_email, test_email)
+    finally:
+        for category in ('feed', 'scrape', 'llm'):
+            slowest = ', '.join(f"{event['name']} {event['dur'] / 1e6:.1f}s" for event in tracer.slowest(category, top=3))
+            if slowest:
+                print(f"Slowest {category} spans: {slowest}")
+        print(f"Trace written to {stop_trace()} (open in ui.perfetto.dev)")
+
+
+def _run_daily_pipeline(use_llm: bool, send_email: bool, test_email: str):
+    # 1. Collect articles (new ones are appended to the persistent article log)
+    with span('collect', 'stage') as stage:
+        article_store = ArticleStore()
+        collector = ArticleCollector(RSS_FEEDS)
+        results = collector.collect_and_store_all(article_store)
+        stage.set(items=sum(len(articles) for articles in results.values()))
     
     # 2. Curate with LLM
-    curator = ArticleCurator(use_llm=use_llm)
-    newsletter_data = curator.curate_newsletter(results, hours=24)
-    with open('data/loading/newsletter_curated.json', 'w') as f:
-        json.dump(newsletter_data, f, indent=2)
+    with span('curate', 'stage'):
+        curator = ArticleCurator(use_llm=use_llm, article_store=article_store)
+        newsletter_data = curator.curate_newsletter(results, hours=24)
+        with open('data/loading/newsletter_curated.json', 'w') as f:
+            json.dump(newsletter_data, f, indent=2)
 
     # 3. Pull quiz data
-    quiz_data = pull_quiz_data(use_llm=use_llm)
+    with span('quiz', 'stage'):
+        quiz_data = pull_quiz_data(use_llm=use_llm)
     print(f"Quiz data status: {quiz_data.get('status')}")
     
     # 3.5. Pull foreign exchange data
-    fx_data = pull_fx_data()
+    with span('fx', 'stage'):
+        fx_data = pull_fx_data()
     print(f"FX data status: {fx_data.get('status')}")
     
     # 3.6. Pull market data (ETF prices)
-    market_data = pull_market_data()
+    with span('market', 'stage'):
+        market_data = pull_market_data()
     print(f"Market data status: {market_data.get('status')}")
 
     # 4. Generate HTML
-    html = generate_newsletter()
+    with span('generate', 'stage'):
+        html = generate_newsletter()
     
     # 5. Send email if requested (simple version while testing deliverability)
     if send_email:
-        if test_email:
-            email_success = send_simple_test_email(test_email)
-            print(f"Test email sent: {email_success}")
-        else:
-            email_success = send_simple_newsletter()
-            print(f"Newsletter email sent: {email_success}")
+        with span('email', 'stage'):
+            if test_email:
+                email_success = send_simple_test_email(test_email)
+                print(f"Test email sent: {email_success}")
+            else:
+                email_success = send_simple_newsletter()
+                print(f"Newsletter email sent: {email_success}")
     
     return newsletter_data
 
@@ -1,13 +1,23 @@
 import yfinance as yf
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, Optional
+import numpy as np
+import logging
+
+sys.path.append(os.getcwd())
+
+from src.mvp_news_aggregator.timeseries import DEFAULT_PERIODS, load_columnar
+from src.mvp_news_aggregator.tracing import span
 try:
     import pandas as pd
 except ImportError:
     pd = None
 
+logger = logging.getLogger(__name__)
+
 # Local storage files
 DAILY_DATA_FILE = 'data/loading/market_data.json'
 
@@ -15,12 +25,6 @@ def _ensure_data_directory():
     """Ensure data/loading directory exists"""
     os.makedirs('data/loading', exist_ok=True)
 
-def _calculate_percentage_change(current: float, historical: float) -> float:
-    """Calculate percentage change between current and historical values"""
-    if historical == 0:
-        return 0.0
-    return round(((current - historical) / historical) * 100, 1)
-
 def get_market_instruments():
     """Define all market instruments with metadata"""
     return {
@@ -119,158 +123,179 @@ def get_market_instruments():
         }
     }
 
+def _extract_close_prices(data, tickers) -> Dict[str, Dict[str, float]]:
+    """Pull {ticker: {date: close}} out of a yf.download frame"""
+    prices = {}
+    
+    # For each ticker, try to extract data
+    for ticker in tickers:
+        try:
+            # Get close prices for this ticker
+            close_data = None
+            if hasattr(data.columns, 'levels'):
+                # MultiIndex columns - structure is (metric, ticker)
+                level_0_values = data.columns.get_level_values(0)  # metrics
+                level_1_values = data.columns.get_level_values(1)  # tickers
+                
+                if 'Close' in level_0_values and ticker in level_1_values:
+                    close_data = data['Close'][ticker]
+            elif len(tickers) == 1:
+                # Single ticker - direct column access
+                close_data = data['Close'] if 'Close' in data.columns else None
+            else:
+                # Sometimes yahoo returns flattened columns
+                close_col = f'{ticker}_Close' if f'{ticker}_Close' in data.columns else None
+                if close_col:
+                    close_data = data[close_col]
+            
+            if close_data is not None:
+                ticker_prices = {}
+                for date, price in close_data.items():
+                    if pd.isna(price):
+                        continue
+                    ticker_prices[date.strftime('%Y-%m-%d')] = round(float(price), 2)
+                
+                if ticker_prices:
+                    prices[ticker] = ticker_prices
+                
+        except Exception as e:
+            print(f"Error processing {ticker}: {e}")
+            continue
+    
+    return prices
+
+def _load_cached_prices(tickers) -> Dict[str, Dict[str, float]]:
+    """Prices already in market_data.json, for tickers we still track"""
+    try:
+        with open(DAILY_DATA_FILE, 'r') as f:
+            daily_prices = json.load(f).get('daily_prices', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    
+    wanted = set(tickers)
+    return {
+        date: {ticker: price for ticker, price in prices.items() if ticker in wanted}
+        for date, prices in daily_prices.items()
+    }
+
 def pull_market_data():
-    """Pull 1 month of market data for all instruments"""
+    """
+    Bring 1 month of market data for all instruments up to date.
+    
+    market_data.json doubles as the local price cache: each ticker is only downloaded
+    from its last cached date onwards (that bar is refetched in case it was partial),
+    tickers new to the instrument list are backfilled over the full window, and
+    tickers sharing a start date go in one yf.download call. If Yahoo fails, the
+    cached prices are kept and still returned.
+    """
     _ensure_data_directory()
     
     instruments = get_market_instruments()
     tickers = list(instruments.keys())
     
-    print(f"Fetching data for {len(tickers)} instruments...")
-    
     # Get 1 month of data
     end_date = datetime.now()
     start_date = end_date - timedelta(days=30)
+    window_start = start_date.strftime('%Y-%m-%d')
     
-    try:
-        # Download data with error handling
-        data = yf.download(tickers, start=start_date, end=end_date, auto_adjust=True, progress=False)
-        
-        if data.empty:
-            return {'daily_prices': {}, 'instruments': instruments, 'fetch_timestamp': datetime.now().isoformat(), 'error': 'No data available'}
-        
-        # Convert to simple daily format
-        daily_prices = {}
-        successful_tickers = set()
-        
-        # For each ticker, try to extract data
-        for ticker in tickers:
-            try:
-                # Get close prices for this ticker
-                if len(tickers) == 1:
-                    # Single ticker - direct column access
-                    close_data = data['Close'] if 'Close' in data.columns else None
-                else:
-                    # Multiple tickers - try different access patterns
-                    close_data = None
-                    if hasattr(data.columns, 'levels'):
-                        # MultiIndex columns - structure is (metric, ticker)
-                        level_0_values = data.columns.get_level_values(0)  # metrics
-                        level_1_values = data.columns.get_level_values(1)  # tickers
-                        
-                        if 'Close' in level_0_values and ticker in level_1_values:
-                            close_data = data['Close'][ticker]
-                    else:
-                        # Sometimes yahoo returns flattened columns
-                        close_col = f'{ticker}_Close' if f'{ticker}_Close' in data.columns else None
-                        if close_col:
-                            close_data = data[close_col]
-                
-                if close_data is not None:
-                    valid_prices = 0
-                    for date, price in close_data.items():
-                        if pd.isna(price):
-                            continue
-                        
-                        date_str = date.strftime('%Y-%m-%d')
-                        if date_str not in daily_prices:
-                            daily_prices[date_str] = {}
-                        
-                        daily_prices[date_str][ticker] = round(float(price), 2)
-                        valid_prices += 1
-                    
-                    if valid_prices > 0:
-                        successful_tickers.add(ticker)
-                    
-            except Exception as e:
-                print(f"Error processing {ticker}: {e}")
+    daily_prices = _load_cached_prices(tickers)
+    
+    # Group tickers by the date their download has to start from
+    last_cached = {}
+    for date in sorted(daily_prices):
+        for ticker in daily_prices[date]:
+            last_cached[ticker] = date
+    
+    downloads = {}
+    for ticker in tickers:
+        fetch_from = last_cached.get(ticker)
+        if fetch_from is None or fetch_from < window_start:
+            fetch_from = window_start
+        downloads.setdefault(fetch_from, []).append(ticker)
+    
+    print(f"Fetching data for {len(tickers)} instruments ({len(last_cached)} cached) in {len(downloads)} download(s)...")
+    
+    successful_tickers = set()
+    errors = []
+    for fetch_from, group in sorted(downloads.items()):
+        try:
+            # Download data with error handling
+            with span('yf.download', 'http', tickers=len(group), start=fetch_from) as download_span:
+                data = yf.download(group, start=fetch_from, end=end_date, auto_adjust=True, progress=False)
+                download_span.set(rows=len(data))
+            if data.empty:
+                errors.append(f"No data available for {', '.join(group)} since {fetch_from}")
                 continue
-        
-        # Remove days with no data
-        daily_prices = {date: prices for date, prices in daily_prices.items() if prices}
-        
-        failed_tickers = set(tickers) - successful_tickers
-        if failed_tickers:
-            print(f"Failed to get data for: {', '.join(failed_tickers)}")
-        if successful_tickers:
-            print(f"Successfully got data for: {', '.join(successful_tickers)}")
-        
-        result = {
-            'daily_prices': daily_prices,
-            'instruments': instruments,
-            'fetch_timestamp': datetime.now().isoformat(),
-            'note': 'Market data fetched from Yahoo Finance'
-        }
-        
-        with open('data/loading/market_data.json', 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        print(f"Saved {len(daily_prices)} days of data for {len(instruments)} instruments")
+            
+            for ticker, ticker_prices in _extract_close_prices(data, group).items():
+                for date_str, price in ticker_prices.items():
+                    daily_prices.setdefault(date_str, {})[ticker] = price
+                successful_tickers.add(ticker)
+                
+        except Exception as e:
+            print(f"Error fetching market data from {fetch_from}: {e}")
+            errors.append(str(e))
+    
+    # Keep the rolling 1-month window and remove days with no data
+    daily_prices = {date: daily_prices[date] for date in sorted(daily_prices)
+                    if date >= window_start and daily_prices[date]}
+    
+    failed_tickers = set(tickers) - successful_tickers
+    if failed_tickers:
+        print(f"Failed to get fresh data for: {', '.join(failed_tickers)} (using cached prices where available)")
+    if successful_tickers:
+        print(f"Successfully got data for: {', '.join(successful_tickers)}")
+    
+    result = {
+        'daily_prices': daily_prices,
+        'instruments': instruments,
+        'fetch_timestamp': datetime.now().isoformat(),
+        'note': 'Market data fetched from Yahoo Finance'
+    }
+    if errors:
+        result['error'] = '; '.join(errors)
+    
+    if not daily_prices:
+        # Nothing fresh and nothing cached - don't overwrite the file with an empty one
         return result
-        
-    except Exception as e:
-        print(f"Error fetching market data: {e}")
-        # Return empty structure on error
-        return {
-            'daily_prices': {},
-            'instruments': instruments,
-            'fetch_timestamp': datetime.now().isoformat(),
-            'error': str(e)
-        }
+    
+    tmp_file = f"{DAILY_DATA_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump({key: value for key, value in result.items() if key != 'error'}, f, indent=2)
+    os.replace(tmp_file, DAILY_DATA_FILE)
+    
+    print(f"Saved {len(daily_prices)} days of data for {len(instruments)} instruments")
+    return result
 
 def get_market_changes_from_daily_data() -> Dict:
     """Calculate current prices and changes from daily data"""
     try:
-        print(f"\n=== MARKET DATA PROCESSING DEBUG ===")
         with open(DAILY_DATA_FILE, 'r') as f:
-            daily_data = json.load(f)
+            instruments = json.load(f).get('instruments', {})
+        frame = load_columnar(DAILY_DATA_FILE, 'daily_prices')
         
-        daily_prices = daily_data.get('daily_prices', {})
-        instruments = daily_data.get('instruments', {})
+        logger.debug(f"Loaded daily data from {DAILY_DATA_FILE}: "
+                     f"{len(frame) if frame else 0} dates x {len(frame.columns) if frame else 0} tickers, "
+                     f"{len(instruments)} instruments defined")
         
-        print(f"Loaded daily data from {DAILY_DATA_FILE}")
-        print(f"Daily prices keys: {len(daily_prices)} dates")
-        print(f"Instruments keys: {len(instruments)} instruments")
-        print(f"Instruments: {list(instruments.keys())}")
-        
-        if not daily_prices:
+        if frame is None or not len(frame):
             print("ERROR: No daily price data available")
             return {'status': 'error', 'error': 'No daily price data available'}
         
-        # Get dates for comparison - use most recent date with reasonable data
-        dates = sorted(daily_prices.keys())
-        if not dates:
-            print("ERROR: No price dates available")
-            return {'status': 'error', 'error': 'No price dates available'}
-        
         # Find the most recent date with reasonable amount of data (at least 8 instruments)
-        today = None
-        for date in reversed(dates):
-            instrument_count = len(daily_prices[date])
-            print(f"Date {date}: {instrument_count} instruments")
-            if instrument_count >= 8:  # Reasonable threshold for good data
-                today = date
-                print(f"Using {today} as base date with {instrument_count} instruments")
-                break
-        
-        if not today:
+        counts = frame.counts()
+        complete_rows = np.flatnonzero(counts >= 8)  # Reasonable threshold for good data
+        if len(complete_rows):
+            today_idx = int(complete_rows[-1])
+            logger.debug(f"Using {frame.dates[today_idx]} as base date with {counts[today_idx]} instruments")
+        else:
             # Fallback to most recent date even if incomplete
-            today = dates[-1]
-            print(f"Fallback: Using {today} as base date")
-        
-        today_idx = dates.index(today)
-        day_1_idx = max(0, today_idx - 1)
-        day_7_idx = max(0, today_idx - 7)
-        day_30_idx = max(0, today_idx - 30)
+            today_idx = len(frame) - 1
+            logger.debug(f"Fallback: Using {frame.dates[today_idx]} as base date")
         
-        current_prices = daily_prices[dates[today_idx]]
-        prices_1d = daily_prices[dates[day_1_idx]] if day_1_idx < today_idx else {}
-        prices_7d = daily_prices[dates[day_7_idx]] if day_7_idx < today_idx else {}
-        prices_30d = daily_prices[dates[day_30_idx]] if day_30_idx < today_idx else {}
-        
-        print(f"Current prices for {today}: {len(current_prices)} instruments")
-        for ticker, price in current_prices.items():
-            print(f"  {ticker}: {price}")
+        # 24h/7d/30d changes for every ticker in one vectorised pass (trading-day rows)
+        changes = frame.changes_by_column(DEFAULT_PERIODS, base_row=today_idx)
+        current_row = frame.values[today_idx]
         
         # Calculate changes
         market_data = {
@@ -279,41 +304,23 @@ def get_market_changes_from_daily_data() -> Dict:
             'status': 'success'
         }
         
-        for ticker, current_price in current_prices.items():
-            print(f"\nProcessing ticker: {ticker} (price: {current_price})")
-            if ticker in instruments:
-                instrument_info = instruments[ticker]
-                print(f"  Found instrument info - Category: {instrument_info['category']}, Symbol: {instrument_info['display_symbol']}")
-                
-                market_data['prices'][ticker] = {
-                    'current': current_price,
-                    'name': instrument_info['name'],
-                    'display_symbol': instrument_info['display_symbol'],
-                    'category': instrument_info['category'],
-                    'currency': instrument_info['currency'],
-                    'changes': {}
-                }
-                
-                # Calculate percentage changes
-                if ticker in prices_1d and prices_1d[ticker]:
-                    change_1d = _calculate_percentage_change(current_price, prices_1d[ticker])
-                    market_data['prices'][ticker]['changes']['24h'] = change_1d
-                
-                if ticker in prices_7d and prices_7d[ticker]:
-                    change_7d = _calculate_percentage_change(current_price, prices_7d[ticker])
-                    market_data['prices'][ticker]['changes']['7d'] = change_7d
-                
-                if ticker in prices_30d and prices_30d[ticker]:
-                    change_30d = _calculate_percentage_change(current_price, prices_30d[ticker])
-                    market_data['prices'][ticker]['changes']['30d'] = change_30d
-                
-                print(f"  ✅ Added {ticker} to market_data")
-            else:
-                print(f"  ❌ {ticker} not found in instruments definition")
+        for j in np.flatnonzero(~np.isnan(current_row)):
+            ticker = frame.columns[j]
+            if ticker not in instruments:
+                logger.debug(f"{ticker} not found in instruments definition")
+                continue
+            
+            instrument_info = instruments[ticker]
+            market_data['prices'][ticker] = {
+                'current': float(current_row[j]),
+                'name': instrument_info['name'],
+                'display_symbol': instrument_info['display_symbol'],
+                'category': instrument_info['category'],
+                'currency': instrument_info['currency'],
+                'changes': changes[ticker]
+            }
         
-        print(f"\nFinal market_data contains {len(market_data['prices'])} instruments")
-        for ticker in market_data['prices'].keys():
-            print(f"  - {ticker}")
+        logger.debug(f"Final market_data contains {len(market_data['prices'])} instruments")
         
         return market_data
         
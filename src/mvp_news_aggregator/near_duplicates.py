@@ -0,0 +1,176 @@
+import re
+import zlib
+from typing import Dict, List, Set, Tuple
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime 2^31 - 1: a * x + b stays inside uint64 for 31-bit a, b and 32-bit x
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+# Articles per vectorised MinHash pass; the intermediate array is num_perm x (shingles in
+# the chunk), so chunking keeps peak memory flat however many articles come in
+SIGNATURE_CHUNK_ARTICLES = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the this to was were will with
+after over says said new after about amid up out more than how why what who when just not but
+""".split())
+
+
+class _UnionFind:
+    """Minimal union-find keyed by article index"""
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return
+        # Lowest index becomes root so "keep first" is just "keep the root"
+        if root_j < root_i:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+
+    def groups(self) -> List[List[int]]:
+        grouped: Dict[int, List[int]] = {}
+        for i in range(len(self.parent)):
+            grouped.setdefault(self.find(i), []).append(i)
+        return [members for members in grouped.values() if len(members) > 1]
+
+
+class NearDuplicateDetector:
+    """
+    Local near-duplicate detection over article title + description.
+
+    Each article is reduced to a set of word uni/bi-gram shingles, summarised by a
+    MinHash signature, and bucketed with LSH banding. Only articles sharing a band
+    bucket are compared, so the cost per article is independent of how many other
+    articles there are, and no network round trip is needed.
+    """
+
+    def __init__(self,
+                 num_perm: int = 64,
+                 bands: int = 32,
+                 threshold: float = 0.5,
+                 candidate_threshold: float = 0.25,
+                 description_chars: int = 200,
+                 seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.candidate_threshold = candidate_threshold
+        self.description_chars = description_chars
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def shingles(self, article: Dict) -> Set[str]:
+        """Word unigram + bigram shingles of title and leading description text"""
+        text = f"{article.get('title', '')} {(article.get('description') or '')[:self.description_chars]}"
+        tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+        shingles = set(tokens)
+        shingles.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return shingles
+
+    def signatures(self, articles: List[Dict], chunk_size: int = SIGNATURE_CHUNK_ARTICLES) -> np.ndarray:
+        """MinHash signatures for all articles (n_articles x num_perm), vectorised per chunk of articles"""
+        if not articles:
+            return np.empty((0, self.num_perm), dtype=np.uint64)
+        return np.concatenate([
+            self._chunk_signatures(articles[start:start + chunk_size])
+            for start in range(0, len(articles), chunk_size)
+        ])
+
+    def _chunk_signatures(self, articles: List[Dict]) -> np.ndarray:
+        hashes = []
+        offsets = []
+        for article in articles:
+            offsets.append(len(hashes))
+            # An empty shingle set hashes a sentinel so every article owns at least one column
+            hashes.extend(zlib.crc32(s.encode('utf-8')) for s in (self.shingles(article) or {''}))
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        # In place, so a chunk needs one num_perm x shingles array rather than three
+        permuted = self._a[:, None] * hashes[None, :]
+        permuted += self._b[:, None]
+        np.remainder(permuted, _MERSENNE_PRIME, out=permuted)
+        return np.minimum.reduceat(permuted, np.asarray(offsets), axis=1).T
+
+    def similar_pairs(self, articles: List[Dict]) -> List[Tuple[int, int, float]]:
+        """Return (i, j, estimated_jaccard) for LSH candidate pairs above candidate_threshold"""
+        signatures = self.signatures(articles)
+
+        candidates = set()
+        for band in range(self.bands):
+            block = signatures[:, band * self.rows:(band + 1) * self.rows]
+            _, bucket_ids = np.unique(block, axis=0, return_inverse=True)
+            bucket_ids = bucket_ids.reshape(-1)
+
+            # Walk buckets in sorted order, pairing up members of any bucket with 2+ articles
+            order = np.argsort(bucket_ids, kind='stable')
+            boundaries = np.flatnonzero(np.diff(bucket_ids[order])) + 1
+            for members in np.split(order, boundaries):
+                if len(members) < 2:
+                    continue
+                members = members.tolist()
+                for pos, i in enumerate(members):
+                    for j in members[pos + 1:]:
+                        candidates.add((i, j))
+
+        if not candidates:
+            return []
+
+        # Estimated Jaccard = fraction of agreeing MinHash rows, for every candidate pair at once
+        pair_index = np.array(sorted(candidates))
+        agreement = (signatures[pair_index[:, 0]] == signatures[pair_index[:, 1]]).mean(axis=1)
+
+        return [
+            (int(i), int(j), float(similarity))
+            for (i, j), similarity in zip(pair_index, agreement)
+            if similarity >= self.candidate_threshold
+        ]
+
+    def find_groups(self, articles: List[Dict]) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Group near-duplicate articles.
+
+        Returns:
+            (duplicate_groups, candidate_groups) - lists of 0-based index groups, each sorted
+            ascending. duplicate_groups are confident matches; candidate_groups link groups
+            whose similarity is only borderline and may be confirmed by a refinement pass.
+        """
+        pairs = self.similar_pairs(articles)
+
+        confirmed = _UnionFind(len(articles))
+        for i, j, similarity in pairs:
+            if similarity >= self.threshold:
+                confirmed.union(i, j)
+
+        borderline = _UnionFind(len(articles))
+        for i, j, similarity in pairs:
+            root_i, root_j = confirmed.find(i), confirmed.find(j)
+            if similarity < self.threshold and root_i != root_j:
+                borderline.union(root_i, root_j)
+
+        return confirmed.groups(), borderline.groups()
+
+    def deduplicate(self, articles: List[Dict]) -> List[Dict]:
+        """Drop all but the first article of each confident near-duplicate group"""
+        duplicate_groups, _ = self.find_groups(articles)
+        to_remove = {idx for group in duplicate_groups for idx in group[1:]}
+        return [article for i, article in enumerate(articles) if i not in to_remove]
@@ -0,0 +1,152 @@
+import os
+import shutil
+from typing import Dict, List
+import logging
+from html_output import ALL_COMPRESSED_SUFFIXES, COMPRESSED_SUFFIXES, compressed_variants
+
+logger = logging.getLogger(__name__)
+
+# Publish outcomes per target path
+WRITTEN = 'written'
+LINKED = 'linked'
+COPIED = 'copied'
+UNCHANGED = 'unchanged'
+REMOVED = 'removed'
+
+
+def _fsync_directory(directory: str):
+    """Persist a rename on POSIX filesystems (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _tmp_path(path: str) -> str:
+    return os.path.join(os.path.dirname(path) or '.', f".{os.path.basename(path)}.{os.getpid()}.tmp")
+
+
+def _has_content(path: str, data: bytes) -> bool:
+    """True if path already holds exactly these bytes (size check first, so misses are cheap)"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _write_durable(path: str, data: bytes):
+    """Write to a temp file in the target directory, fsync, then atomically rename into place"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(os.path.dirname(path))
+
+
+def _link_or_copy(source: str, path: str) -> str:
+    """Point path at source's bytes: hardlink where the filesystem allows, durable copy otherwise"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = _tmp_path(path)
+    try:
+        os.link(source, tmp_path)
+        outcome = LINKED
+    except OSError:
+        # Cross-device, or a filesystem without hardlinks
+        shutil.copyfile(source, tmp_path)
+        with open(tmp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        outcome = COPIED
+
+    try:
+        # Renaming over the target (rather than writing into it) never touches an inode
+        # that another published path might share
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(os.path.dirname(path))
+    return outcome
+
+
+def publish_bytes(data: bytes, targets: List[str]) -> Dict[str, str]:
+    """
+    Publish the same bytes to several paths, writing them to disk only once.
+
+    The first target is written durably (temp file, fsync, atomic rename); the rest
+    become hardlinks to it, falling back to copies. Any target that already holds
+    identical bytes is left alone, so unchanged output never churns git or Pages.
+    """
+    primary, mirrors = targets[0], targets[1:]
+    outcomes = {}
+
+    if _has_content(primary, data):
+        outcomes[primary] = UNCHANGED
+    else:
+        _write_durable(primary, data)
+        outcomes[primary] = WRITTEN
+
+    for path in mirrors:
+        try:
+            same_file = os.path.samefile(primary, path)
+        except OSError:
+            same_file = False
+
+        if same_file or _has_content(path, data):
+            outcomes[path] = UNCHANGED
+        else:
+            outcomes[path] = _link_or_copy(primary, path)
+
+    return outcomes
+
+
+def publish_text(content: str, targets: List[str], precompress: bool = True) -> Dict[str, str]:
+    """
+    Publish text (a page or asset) to every target, plus .gz/.br siblings.
+
+    Compression is skipped entirely when the text and all siblings are already up to
+    date. Returns the outcome for each path written, siblings included.
+    """
+    data = content.encode('utf-8')
+    outcomes = publish_bytes(data, targets)
+
+    if precompress:
+        variants = None
+        text_changed = any(outcome != UNCHANGED for outcome in outcomes.values())
+        for suffix in COMPRESSED_SUFFIXES:
+            sibling_targets = [f"{path}{suffix}" for path in targets]
+            if not text_changed and all(os.path.exists(path) for path in sibling_targets):
+                outcomes.update({path: UNCHANGED for path in sibling_targets})
+                continue
+            if variants is None:
+                variants = compressed_variants(data)
+            outcomes.update(publish_bytes(variants[suffix], sibling_targets))
+
+    # A sibling left over from an encoding we can no longer produce would be served stale
+    for suffix in ALL_COMPRESSED_SUFFIXES:
+        if precompress and suffix in COMPRESSED_SUFFIXES:
+            continue
+        for path in targets:
+            if os.path.exists(f"{path}{suffix}"):
+                os.remove(f"{path}{suffix}")
+                outcomes[f"{path}{suffix}"] = REMOVED
+
+    logger.debug(f"Published {targets[0]}: {outcomes}")
+    return outcomes
@@ -4,9 +4,15 @@ import logging
 import json
 import os
 import random
-import google.generativeai as genai
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.getcwd())
+
+from src.mvp_news_aggregator.llm_cache import LLMResponseCache
+from src.mvp_news_aggregator.llm_backends import ModelBackend, create_model
+from src.mvp_news_aggregator.tracing import span
+
 # Load environment configuration
 if True:
     load_dotenv("../../config.env")
@@ -19,19 +25,25 @@ class QuizGenerator:
     Follows the same architectural patterns as ArticleCurator.
     """
     
-    def __init__(self, use_llm: bool = True):
+    def __init__(self, use_llm: bool = True, use_llm_cache: bool = True, model: Optional[ModelBackend] = None):
         """
         Initialize quiz generator with optional LLM usage.
         
         Args:
             use_llm: Whether to use LLM for quiz generation or fallback to static questions
+            use_llm_cache: Whether to reuse cached LLM responses for identical prompts
+            model: Model backend to use instead of the configured one (see llm_backends)
         """
         self.use_llm = use_llm
+        self.model_name = 'gemini-2.0-flash'
+        self.llm_cache = None
         
         if self.use_llm:
-            # Initialize Gemini LLM using same configuration as curator
-            genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            # Initialize the LLM backend using same configuration as curator
+            self.model = model or create_model(self.model_name)
+            self.model_name = self.model.model_name
+            if use_llm_cache:
+                self.llm_cache = LLMResponseCache()
         else:
             self.model = None
             print("LLM disabled - using fallback question bank for quiz generation")
@@ -132,9 +144,20 @@ Return ONLY valid JSON in this exact format:
 
 Generate exactly {question_count} questions now:"""
 
+        # The prompt is identical every day, so key the cache by date as well -
+        # regenerating today reuses today's quiz, tomorrow gets a fresh one
+        cache_key = None
+        
         try:
             # Call LLM and parse response
-            response = self.model.generate_content(prompt)
+            with span(self.model_name, 'llm', prompt_chars=len(prompt)) as llm_span:
+                if self.llm_cache is not None:
+                    today = datetime.now().strftime('%Y-%m-%d')
+                    cache_key = self.llm_cache.make_key(self.model_name, prompt, extra=today)
+                    response = self.llm_cache.generate(self.model, self.model_name, prompt, extra=today)
+                else:
+                    response = self.model.generate_content(prompt)
+                llm_span.set(response_chars=len(response.text))
             response_text = response.text.strip()
             
             # Clean up response text (remove markdown formatting if present)
@@ -168,11 +191,15 @@ Generate exactly {question_count} questions now:"""
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM JSON response: {e}")
+            if cache_key:
+                self.llm_cache.discard(cache_key)
             print(f"LLM JSON parsing failed, falling back to static questions")
             return self.fallback_quiz(topics, difficulty, question_count)
             
         except Exception as e:
             logger.error(f"LLM quiz generation failed: {e}")
+            if cache_key:
+                self.llm_cache.discard(cache_key)
             print(f"LLM generation failed ({e}), falling back to static questions")
             return self.fallback_quiz(topics, difficulty, question_count)
 
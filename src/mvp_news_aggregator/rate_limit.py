@@ -0,0 +1,79 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Allows bursts of up to `capacity` calls, refilling at `rate` tokens per second.
+    Shared between worker threads so that concurrent callers respect one global limit.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns the time spent waiting in seconds."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if available right now, without blocking"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+
+class HostRateLimiter:
+    """Per-host politeness limit: at most N in-flight requests and a minimum gap between request starts"""
+    def __init__(self, max_per_host: int = 1, min_interval: float = 1.0):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._last_start = {}
+
+    def _host_state(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.max_per_host)
+                self._last_start[host] = 0.0
+            return self._semaphores[host]
+
+    def acquire(self, url: str) -> str:
+        """Block until a request to this URL's host is allowed, return the host key for release()"""
+        host = urlparse(url).netloc.lower()
+        self._host_state(host).acquire()
+        with self._lock:
+            wait = self._last_start[host] + self.min_interval - time.monotonic()
+            self._last_start[host] = max(time.monotonic(), self._last_start[host] + self.min_interval)
+        if wait > 0:
+            time.sleep(wait)
+        return host
+
+    def release(self, host: str):
+        self._semaphores[host].release()
@@ -0,0 +1,92 @@
+import os
+import re
+import hashlib
+from typing import Dict, Iterable, List
+import logging
+from html_output import ALL_COMPRESSED_SUFFIXES
+from publisher import REMOVED, publish_text
+
+logger = logging.getLogger(__name__)
+
+# Directory, relative to each published page, that holds its generated CSS/JS - kept
+# apart from the hand-maintained images in assets/
+ASSET_DIR_NAME = 'assets/build'
+
+# Generated asset names (stem.<12 hex>.ext), as referenced from pages
+HASHED_ASSET_PATTERN = re.compile(r'[\w-]+\.[0-9a-f]{12}\.(?:css|js)')
+
+
+def content_hash(content: str, length: int = 12) -> str:
+    """Short SHA-256 of the asset content, used to fingerprint file names"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:length]
+
+
+def hashed_name(stem: str, extension: str, content: str) -> str:
+    """newsletter + css + content -> newsletter.<hash>.css"""
+    return f"{stem}.{content_hash(content)}.{extension}"
+
+
+def asset_href(filename: str) -> str:
+    """URL of an asset as referenced from a page"""
+    return f"{ASSET_DIR_NAME}/{filename}"
+
+
+def asset_directories(page_paths: List[str]) -> Dict[str, str]:
+    """{page directory: its asset directory} for the given pages, in order"""
+    directories = {}
+    for page_path in page_paths:
+        page_directory = os.path.dirname(page_path) or '.'
+        directories.setdefault(page_directory, os.path.join(page_directory, ASSET_DIR_NAME))
+    return directories
+
+
+def publish_assets(page_paths: List[str], assets: Dict[str, str]) -> Dict[str, str]:
+    """
+    Make sure every {filename: content} asset exists in the assets/build dir next to each page.
+
+    The hash is part of each name, so an asset that already exists everywhere always
+    has the right content and is skipped. Otherwise it is written once and hardlinked
+    into the other directories (with .gz/.br siblings).
+    """
+    directories = list(asset_directories(page_paths).values())
+
+    outcomes = {}
+    for filename, content in assets.items():
+        targets = [os.path.join(directory, filename) for directory in directories]
+        if all(os.path.exists(path) for path in targets):
+            continue
+        outcomes.update(publish_text(content, targets))
+        logger.info(f"Published asset {filename} to {', '.join(directories)}")
+    return outcomes
+
+
+def prune_assets(page_paths: List[str], keep: Iterable[str]) -> Dict[str, str]:
+    """
+    Remove generated assets that no page references any more (older CSS/JS builds).
+
+    Every .html page in each page directory is checked, so archived editions keep the
+    builds they were published with. Call this after the pages themselves are written.
+    """
+    outcomes = {}
+    for page_directory, directory in asset_directories(page_paths).items():
+        if not os.path.isdir(directory):
+            continue
+        referenced = set(keep)
+        for name in os.listdir(page_directory):
+            if name.endswith('.html'):
+                with open(os.path.join(page_directory, name), 'r', encoding='utf-8') as f:
+                    referenced.update(HASHED_ASSET_PATTERN.findall(f.read()))
+
+        for name in os.listdir(directory):
+            base = name
+            for suffix in ALL_COMPRESSED_SUFFIXES:
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if HASHED_ASSET_PATTERN.fullmatch(base) and base not in referenced:
+                path = os.path.join(directory, name)
+                os.remove(path)
+                outcomes[path] = REMOVED
+
+    if outcomes:
+        logger.info(f"Pruned {len(outcomes)} stale asset files")
+    return outcomes
@@ -0,0 +1,93 @@
+import string
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+_FORMATTER = string.Formatter()
+
+
+class Template:
+    """
+    A str.format-style template compiled once into literal chunks and {field} slots,
+    plus a generated f-string function that renders the whole thing in one call.
+
+    Rendering appends pieces to a `write` callable (list.append, StringIO.write or an
+    open file's write), so output is built in linear time and can stream straight to
+    disk. A field whose value is callable is treated as a nested section and called
+    with `write`, letting page skeletons stream their sections without building them
+    as strings first. Use {{ and }} for literal braces, as with str.format.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        parts = []
+        for literal, field, spec, conversion in _FORMATTER.parse(source):
+            if literal:
+                parts.append((literal, None, None))
+            if field is None:
+                continue
+            if not field.isidentifier() or conversion:
+                raise ValueError(f"Unsupported template field '{{{field}}}' - use plain names")
+            parts.append((None, field, spec or None))
+        self.parts = tuple(parts)
+        self.fields = frozenset(field for _, field, _ in parts if field)
+        self._render_flat = self._compile(self.parts)
+
+    @staticmethod
+    def _compile(parts) -> Callable[[Dict], str]:
+        """
+        Generate a single f-string function for the template.
+
+        Literal chunks are bound as constants rather than pasted into the source, so
+        they never need escaping; only identifier field names and format specs are.
+        """
+        constants = {}
+        pieces = []
+        for literal, field, spec in parts:
+            if field is None:
+                name = f"_L{len(constants)}"
+                constants[name] = literal
+                pieces.append(f"{{{name}}}")
+            elif spec:
+                if any(char in spec for char in '{}"\'\\'):
+                    raise ValueError(f"Unsupported format spec '{spec}'")
+                pieces.append(f"{{_f['{field}']:{spec}}}")
+            else:
+                pieces.append(f"{{_f['{field}']}}")
+
+        code = f'lambda _f: f"{"".join(pieces)}"'
+        return eval(code, constants)
+
+    def render_into(self, write: Callable[[str], object], context: Optional[Dict] = None, **fields):
+        """Write the rendered template to `write`"""
+        if context:
+            fields = {**context, **fields}
+
+        # No nested sections: the compiled f-string renders the whole template in one go
+        if not any(map(callable, fields.values())):
+            write(self._render_flat(fields))
+            return
+
+        for literal, field, spec in self.parts:
+            if field is None:
+                write(literal)
+                continue
+            value = fields[field]
+            if spec:
+                write(format(value, spec))
+            elif isinstance(value, str):
+                write(value)
+            elif callable(value):
+                value(write)
+            else:
+                write(format(value))
+
+    def render(self, context: Optional[Dict] = None, **fields) -> str:
+        buffer = []
+        self.render_into(buffer.append, context, **fields)
+        return ''.join(buffer)
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> Template:
+    """Compile a template source once; later calls with the same source reuse it"""
+    return Template(source)
@@ -0,0 +1,163 @@
+import os
+import json
+from typing import Dict, List, Optional, Sequence
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columnar copies of the data/loading JSON files
+COLUMNAR_CACHE_DIR = 'data/cache'
+
+# Standard reporting periods, in rows (trading days) or calendar days depending on the caller
+DEFAULT_PERIODS = {'24h': 1, '7d': 7, '30d': 30}
+
+
+class TimeSeriesFrame:
+    """
+    Columnar daily time series: a sorted dates vector plus a float64 matrix.
+
+    `values[i, j]` is the value of `columns[j]` on `dates[i]`; gaps are NaN. Change
+    calculations work on whole rows at once, so cost barely grows with the number
+    of instruments or the length of history.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: Sequence[str], values: np.ndarray):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.columns = list(columns)
+        self.values = np.asarray(values, dtype=np.float64)
+        self._column_index = {column: j for j, column in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def from_daily_dict(cls, daily: Dict[str, Dict[str, float]], columns: Optional[Sequence[str]] = None) -> 'TimeSeriesFrame':
+        """Build from the {date: {ticker: value}} layout used by the JSON files"""
+        dates = sorted(daily.keys())
+        if columns is None:
+            seen = {}
+            for date in dates:
+                seen.update(dict.fromkeys(daily[date]))
+            columns = list(seen)
+        column_index = {column: j for j, column in enumerate(columns)}
+
+        values = np.full((len(dates), len(columns)), np.nan)
+        for i, date in enumerate(dates):
+            for column, value in daily[date].items():
+                j = column_index.get(column)
+                if j is not None and value is not None:
+                    values[i, j] = value
+
+        return cls(np.array(dates, dtype='datetime64[D]'), columns, values)
+
+    def to_daily_dict(self) -> Dict[str, Dict[str, float]]:
+        """Back to {date: {ticker: value}}, dropping gaps and empty days"""
+        daily = {}
+        for date, row in zip(self.dates.astype(str), self.values):
+            present = ~np.isnan(row)
+            if present.any():
+                daily[date] = {self.columns[j]: float(row[j]) for j in np.flatnonzero(present)}
+        return daily
+
+    def save(self, path: str):
+        """Write dates, columns and values to a single .npz (atomically)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, dates=self.dates, columns=np.array(self.columns, dtype=str), values=self.values)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TimeSeriesFrame':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['dates'], data['columns'].tolist(), data['values'])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self._column_index[name]]
+
+    def counts(self) -> np.ndarray:
+        """Number of non-missing values on each date"""
+        return np.count_nonzero(~np.isnan(self.values), axis=1)
+
+    def reference_rows(self, lags: Sequence[int], base_row: int = -1, calendar_days: bool = False) -> np.ndarray:
+        """
+        Row index to compare against for each lag, or -1 when there is none.
+
+        With calendar_days the reference is the latest date on or before base date - lag;
+        otherwise it is `lag` rows earlier (clamped to the first row, as long as that is
+        still before the base row).
+        """
+        base_row = base_row % len(self.dates)
+        lags = np.asarray(lags, dtype=np.int64)
+
+        if calendar_days:
+            targets = self.dates[base_row] - lags.astype('timedelta64[D]')
+            rows = np.searchsorted(self.dates, targets, side='right') - 1
+        else:
+            rows = np.maximum(base_row - lags, 0)
+            rows[rows >= base_row] = -1
+        return rows
+
+    def pct_changes(self, lags: Sequence[int], base_row: int = -1, calendar_days: bool = False) -> np.ndarray:
+        """
+        Percentage change from each lag to the base row for every column in one pass.
+
+        Returns a (len(lags), n_columns) array; NaN where either value is missing,
+        there is no reference row, or the reference value is zero.
+        """
+        base_row = base_row % len(self.dates)
+        rows = self.reference_rows(lags, base_row, calendar_days)
+
+        reference = self.values[rows]
+        reference[rows < 0] = np.nan
+        reference[reference == 0] = np.nan
+        return (self.values[base_row] - reference) / reference * 100
+
+    def changes_by_column(self, periods: Dict[str, int] = DEFAULT_PERIODS, base_row: int = -1,
+                          calendar_days: bool = False, decimals: int = 1) -> Dict[str, Dict[str, float]]:
+        """{column: {period_label: rounded pct change}}, omitting periods with no valid change"""
+        labels = list(periods)
+        pct = self.pct_changes([periods[label] for label in labels], base_row, calendar_days)
+
+        changes = {column: {} for column in self.columns}
+        for k, j in zip(*np.nonzero(~np.isnan(pct))):
+            changes[self.columns[j]][labels[k]] = round(float(pct[k, j]), decimals)
+        return changes
+
+
+def columnar_path(json_path: str) -> str:
+    """data/loading/market_data.json -> data/cache/market_data.npz"""
+    name = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(COLUMNAR_CACHE_DIR, f"{name}.npz")
+
+
+def load_columnar(json_path: str, key: str, columns: Optional[List[str]] = None) -> Optional[TimeSeriesFrame]:
+    """
+    Load the columnar copy of a daily JSON store, rebuilding it when the JSON is newer.
+
+    The JSON stays the source of truth (it's what gets committed); the .npz is a
+    derived cache so repeat reads skip JSON parsing and dict walking.
+    """
+    npz_path = columnar_path(json_path)
+    try:
+        json_mtime = os.path.getmtime(json_path)
+    except OSError:
+        return None
+
+    if os.path.exists(npz_path) and os.path.getmtime(npz_path) >= json_mtime:
+        try:
+            frame = TimeSeriesFrame.load(npz_path)
+            if columns is None or frame.columns == list(columns):
+                return frame
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable columnar cache {npz_path}: {e}")
+
+    with open(json_path, 'r') as f:
+        daily = json.load(f).get(key, {})
+    frame = TimeSeriesFrame.from_daily_dict(daily, columns)
+
+    try:
+        frame.save(npz_path)
+    except Exception as e:
+        logger.warning(f"Could not write columnar cache {npz_path}: {e}")
+    return frame
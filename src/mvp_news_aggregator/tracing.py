@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import itertools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One Chrome-trace JSON file per run, loadable in ui.perfetto.dev or chrome://tracing
+TRACE_DIR = 'data/traces'
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+_active_tracer: Optional['Tracer'] = None
+
+
+class Span:
+    """A timed region of work; `args` (bytes, items, status...) end up in the trace event"""
+
+    def __init__(self, span_id: int, name: str, category: str, args: Dict, parent: Optional['Span']):
+        self.id = span_id
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent = parent
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        self.mem_start = 0
+        self.mem_peak = 0
+
+    def set(self, **args):
+        """Record (or overwrite) values on the span"""
+        self.args.update(args)
+
+    def add(self, key: str, amount: float = 1):
+        """Accumulate a count, e.g. bytes read across several responses"""
+        self.args[key] = self.args.get(key, 0) + amount
+
+
+class _NoopSpan:
+    """Stand-in when tracing is off, so instrumented code never has to check"""
+    args = {}
+
+    def set(self, **args):
+        pass
+
+    def add(self, key: str, amount: float = 1):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans for one run and exports them as Chrome trace events.
+
+    Spans nest per thread through a context variable. Work handed to another thread
+    keeps its parent via in_current_span(), and the hand-off shows up as a flow arrow
+    in the trace viewer.
+
+    With track_memory, each span also records the peak of Python allocations
+    (tracemalloc) while it was open. That is process-wide, so concurrent spans share it.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now()
+        self.events = []
+        self.thread_names = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.track_memory = track_memory
+        self._open_spans = set()
+        self._started_tracemalloc = track_memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    def _fold_peak(self) -> int:
+        """Credit the peak since the last reset to every open span, then reset it (lock held)"""
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for open_span in self._open_spans:
+            open_span.mem_peak = max(open_span.mem_peak, peak)
+        return current
+
+    def open(self, name: str, category: str, args: Dict) -> Span:
+        span = Span(next(self._ids), name, category, args, _current_span.get())
+        if self.track_memory:
+            with self._lock:
+                span.mem_start = span.mem_peak = self._fold_peak()
+                self._open_spans.add(span)
+        return span
+
+    def close(self, span: Span):
+        end = time.perf_counter()
+        thread = threading.current_thread()
+        if self.track_memory:
+            with self._lock:
+                self._fold_peak()
+                self._open_spans.discard(span)
+            span.set(mem_start_kb=span.mem_start // 1024, mem_peak_kb=span.mem_peak // 1024)
+        event = {
+            'name': span.name, 'cat': span.category, 'ph': 'X', 'pid': os.getpid(), 'tid': span.thread_id,
+            'ts': self._micros(span.start), 'dur': round((end - span.start) * 1e6, 1),
+            'args': {**span.args, 'span_id': span.id, 'parent_id': span.parent.id if span.parent else None}
+        }
+        with self._lock:
+            self.thread_names.setdefault(span.thread_id, thread.name)
+            self.events.append(event)
+            if span.parent is not None and span.parent.thread_id != span.thread_id:
+                # Flow arrow from the parent's thread to where the child actually ran
+                flow = {'name': span.name, 'cat': 'handoff', 'id': span.id, 'pid': os.getpid(),
+                        'ts': self._micros(span.start)}
+                self.events.append({**flow, 'ph': 's', 'tid': span.parent.thread_id})
+                self.events.append({**flow, 'ph': 'f', 'bp': 'e', 'tid': span.thread_id})
+
+    def _micros(self, timestamp: float) -> float:
+        return round((timestamp - self.origin) * 1e6, 1)
+
+    def to_chrome_trace(self) -> Dict:
+        with self._lock:
+            events = list(self.events)
+            names = dict(self.thread_names)
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                    for tid, name in names.items()]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                'otherData': {'started_at': self.started_at.isoformat()}}
+
+    def slowest(self, category: str, top: int = 5) -> List[Dict]:
+        """The longest spans of one category, for a quick summary without opening the trace"""
+        with self._lock:
+            spans = [event for event in self.events if event['ph'] == 'X' and event['cat'] == category]
+        return sorted(spans, key=lambda event: event['dur'], reverse=True)[:top]
+
+    def finish(self):
+        """Stop memory tracking if this tracer started it"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def export(self, path: Optional[str] = None) -> str:
+        """Write the trace JSON (default data/traces/trace_<timestamp>.json) and return its path"""
+        if path is None:
+            path = os.path.join(TRACE_DIR, f"trace_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+
+def start_trace(track_memory: bool = False) -> Tracer:
+    """Begin recording spans for this run (track_memory adds per-span peak memory, at a speed cost)"""
+    global _active_tracer
+    _active_tracer = Tracer(track_memory=track_memory)
+    return _active_tracer
+
+
+def stop_trace(path: Optional[str] = None) -> Optional[str]:
+    """Stop recording and export the trace; returns the file written (None if not tracing)"""
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    if tracer is None:
+        return None
+    tracer.finish()
+    return tracer.export(path)
+
+
+@contextmanager
+def span(name: str, category: str = 'pipeline', /, **args):
+    """Time a block as a child of the current span: `with span('fetch', 'feed', url=url) as s: s.set(bytes=n)`"""
+    tracer = _active_tracer
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+
+    current = tracer.open(name, category, args)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.close(current)
+
+
+def current_span():
+    """The innermost open span (a no-op span when tracing is off)"""
+    return (_current_span.get() if _active_tracer is not None else None) or NOOP_SPAN
+
+
+def in_current_span(func: Callable) -> Callable:
+    """Wrap func so spans it opens in a worker thread nest under the caller's current span"""
+    parent = _current_span.get()
+
+    def run(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return run
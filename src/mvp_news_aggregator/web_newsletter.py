@@ -1,14 +1,211 @@
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Callable, Dict, List, Optional
 import json
 import os
+import logging
+import textwrap
 import pytz
-from foreign_exchange_data import get_fx_changes_from_daily_data
-from market_data import get_market_changes_from_daily_data
+from data_snapshot import DataSnapshot
+from foreign_exchange_data import FX_PAIRS
+from fragment_cache import FragmentCache, source_fingerprint
+from html_output import minify_css, minify_html
+from publisher import publish_text
+from static_assets import asset_href, hashed_name, prune_assets, publish_assets
+import templates
+from templates import Template, compile_template
+
+logger = logging.getLogger(__name__)
+
+NZ_TZ = pytz.timezone('Pacific/Auckland')
+
+CHANGE_PERIODS = ['24h', '7d', '30d']
+
+# Templates are compiled once at import; sections render straight into the output buffer
+PAGE_TEMPLATE = compile_template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Daily News Feed - {date}</title>
+    {styles}
+</head>
+<body>
+    <div class="container">
+        {header}
+        {fx_box}
+        {market_box}
+        {content}
+        {quiz}
+        {footer}
+    </div>
+    
+    {scripts}
+</body>
+</html>""")
+
+# Page styles/scripts: inline, or external content-hashed files under each page's assets/build dir
+STYLE_INLINE_TEMPLATE = compile_template('<style>\n        {css}\n    </style>')
+STYLE_LINK_TEMPLATE = compile_template('<link rel="stylesheet" href="{href}">')
+SCRIPT_INLINE_TEMPLATE = compile_template('<script>\n{js}    </script>')
+SCRIPT_LINK_TEMPLATE = compile_template('<script src="{href}"></script>')
+# Kept in the page rather than the stylesheet: a url() in an external CSS file resolves
+# against the CSS file's own location, not the page's
+HEADER_IMAGE_STYLE = "<style>.header { background-image: url('assets/dunder_park.jpg'); }</style>"
+
+NEWSLETTER_JS = """        function toggleCategory(categoryId) {
+            const category = document.querySelector(`[data-category="${categoryId}"]`);
+            const icon = category.querySelector('.toggle-icon');
+            
+            if (category.classList.contains('collapsed')) {
+                category.classList.remove('collapsed');
+                category.classList.add('expanded');
+                icon.textContent = '\u2212';
+            } else {
+                category.classList.remove('expanded');
+                category.classList.add('collapsed');
+                icon.textContent = '+';
+            }
+        }
+        
+        function revealAnswer(questionId) {
+            const answerDiv = document.getElementById(`answer-${questionId}`);
+            const button = document.getElementById(`reveal-${questionId}`);
+            
+            answerDiv.style.display = 'block';
+            button.style.display = 'none';
+        }
+"""
+
+QUIZ_HEADER_TEMPLATE = compile_template(
+    '<div class="quiz-box">'
+    '<div class="quiz-header">'
+    '<h3 class="quiz-title">Daily Knowledge Quiz</h3>'
+    '<div class="quiz-meta">{ai_label}{count} Questions • {difficulty} Level</div>'
+    '</div>'
+    '<p style="margin-bottom: 1.5rem; color: #6c757d; font-size: 0.9rem;">'
+    'Test your knowledge across geography, STEM, history, and general topics. '
+    'Click "Show Answer" to reveal the solution with explanation.'
+    '</p>'
+)
+QUIZ_QUESTION_TEMPLATE = compile_template(
+    '<div class="quiz-question">'
+    '<div class="quiz-question-header">'
+    '<span class="quiz-question-number">{number}</span>'
+    '<span class="quiz-category">{category}</span>'
+    '</div>'
+    '<div class="quiz-question-text">{question}</div>'
+    '<div class="quiz-options">{options}</div>'
+    '<button class="quiz-reveal-button" id="reveal-{number}" onclick="revealAnswer({number})">Show Answer</button>'
+    '<div class="quiz-answer-section" id="answer-{number}">'
+    '<div class="quiz-correct-answer">Answer: {answer}</div>'
+    '{explanation}'
+    '</div>'
+    '</div>'
+)
+QUIZ_OPTION_TEMPLATE = compile_template('<div class="quiz-option">{option}</div>')
+QUIZ_EXPLANATION_TEMPLATE = compile_template('<div class="quiz-explanation">{explanation}</div>')
+
+FX_UNAVAILABLE_HTML = '<div class="fx-box"><p>Foreign exchange data currently unavailable</p></div>'
+FX_BOX_OPEN_TEMPLATE = compile_template(
+    '<div class="fx-box">'
+    '<div class="fx-header">'
+    '<h3 class="fx-title">Foreign Exchange Rates</h3>'
+    '<div class="fx-timestamp">{timestamp}</div>'
+    '</div>'
+    '<div class="fx-grid">'
+    '<div class="fx-dxy-row">'
+    '<div class="fx-rate">'
+    '<div class="fx-pair">DXY (US Dollar Index)</div>'
+    '<div class="fx-value">{dxy_value}</div>'
+    '<div class="fx-changes">{dxy_changes}</div>'
+    '</div>'
+    '</div>'
+    '<div class="fx-currencies-grid">'
+)
+FX_RATE_TEMPLATE = compile_template(
+    '<div class="fx-rate">'
+    '<div class="fx-pair">{pair}</div>'
+    '<div class="fx-value">{value}</div>'
+    '{changes}'
+    '</div>'
+)
+FX_CHANGES_TEMPLATE = compile_template('<div class="fx-changes">{changes}</div>')
+FX_CHANGE_TEMPLATE = compile_template('<span class="fx-change {color_class}">{period} {sign}{change:.1f}%</span>')
+FX_CHANGE_MISSING_TEMPLATE = compile_template('<span class="fx-change neutral">{period} +0.0%</span>')
+FX_BOX_CLOSE_HTML = '</div></div></div>'  # fx-currencies-grid, fx-grid, fx-box
+
+MARKET_UNAVAILABLE_HTML = '<div class="market-box"><p>Market data currently unavailable</p></div>'
+# Category ID mapping for JavaScript (also the display order)
+MARKET_CATEGORY_IDS = {
+    'US Indices': 'us-indices',
+    'Currency Indices': 'currency-indices',
+    'International Indices': 'international',
+    'Commodities': 'commodities',
+    'ETFs': 'etfs'
+}
+MARKET_BOX_OPEN_TEMPLATE = compile_template(
+    '<div class="market-box">'
+    '<div class="market-header">'
+    '<h3 class="market-title">Market Data</h3>'
+    '<div class="market-timestamp">{timestamp}</div>'
+    '</div>'
+)
+MARKET_CATEGORY_OPEN_TEMPLATE = compile_template(
+    '<div class="market-category collapsed" data-category="{category_id}">'
+    '<div class="market-category-header" onclick="toggleCategory(\'{category_id}\')">'
+    '<div class="market-category-title">'
+    '<span class="toggle-icon">+</span>'
+    '{category_name}'
+    '<span class="category-count">({count})</span>'
+    '</div>'
+    '</div>'
+    '<div class="market-instruments">'
+    '<div class="market-instruments-grid">'
+)
+MARKET_INSTRUMENT_TEMPLATE = compile_template(
+    '<div class="market-instrument-card">'
+    '<div class="market-symbol">{symbol}</div>'
+    '<div class="market-price">{price:,} {currency}</div>'
+    '<div class="market-changes">{changes}</div>'
+    '</div>'
+)
+MARKET_CHANGE_TEMPLATE = compile_template('<div class="market-change {color_class}">{period} {sign}{change:.1f}%</div>')
+MARKET_CHANGE_MISSING_TEMPLATE = compile_template('<div class="market-change neutral">{period} -</div>')
+MARKET_CATEGORY_CLOSE_HTML = '</div></div></div>'  # market-instruments-grid, market-instruments, market-category
+
+ARTICLE_TIER_CLASSES = {
+    "critical": "article critical",
+    "key": "article key",
+    "monitoring": "article monitoring"
+}
+ARTICLE_OPEN_TEMPLATE = compile_template(
+    '<div class="{css_class}">'
+    '<div class="article-header">'
+    '<span class="category-badge {category_label}">{category_display}</span>'
+    '<div class="article-title"><a href="{url}" target="_blank">{title}</a></div>'
+    '</div>'
+    '<div class="article-meta">{source} • {published}{priority}</div>'
+)
+ARTICLE_SUMMARY_TEMPLATE = compile_template('<div class="article-summary">{summary}</div>')
+ARTICLE_WHY_MATTERS_TEMPLATE = compile_template('<div class="why-matters"><strong>Why this matters:</strong> {why_matters}</div>')
+ARTICLE_REASON_TEMPLATE = compile_template('<div class="article-reason">{reason}</div>')
 
 class NewsletterGenerator:
-    def __init__(self):
-        pass
+    def __init__(self, inline_assets: bool = False, minify: bool = True,
+                 fragment_cache: Optional[FragmentCache] = None):
+        # External assets are fingerprinted by content, so browsers can cache them
+        # across every edition and unchanged styles are never rewritten
+        self.inline_assets = inline_assets
+        self.minify = minify
+        # With a fragment cache, sections whose inputs are unchanged are reused, not re-rendered
+        self.fragment_cache = fragment_cache
+        self.asset_contents = {
+            'css': minify_css(self.get_css()) if minify else self.get_css(),
+            'js': textwrap.dedent(self.get_js())
+        }
+        self.asset_files = {
+            kind: hashed_name('newsletter', kind, content) for kind, content in self.asset_contents.items()
+        }
     
     def get_nz_date(self) -> str:
         """Get current date in New Zealand timezone"""
@@ -40,66 +237,42 @@ class NewsletterGenerator:
         Generate daily quiz section with inline answers for bottom of newsletter.
         Returns empty string if no quiz data available.
         """
+        buffer = []
+        self.render_quiz_section(buffer.append, quiz_data)
+        return ''.join(buffer)
+    
+    def render_quiz_section(self, write: Callable[[str], object], quiz_data: Dict):
+        """Stream the quiz section to `write` (nothing if no quiz data available)"""
         if not quiz_data or not quiz_data.get('questions'):
             print("No quiz data available for newsletter")
-            return ''
+            return
         
         questions = quiz_data['questions']
         metadata = quiz_data.get('metadata', {})
         
-        # Create quiz header with metadata
-        html = '<div class="quiz-box">'
-        html += '<div class="quiz-header">'
-        html += '<h3 class="quiz-title">Daily Knowledge Quiz</h3>'
-        html += '<div class="quiz-meta">'
-        
-        if metadata.get('generated_with_llm'):
-            html += 'AI Generated • '
-        html += f"{len(questions)} Questions • {metadata.get('difficulty', 'medium').title()} Level"
-        html += '</div>'
-        html += '</div>'
-        
-        # Add intro note
-        html += '<p style="margin-bottom: 1.5rem; color: #6c757d; font-size: 0.9rem;">'
-        html += 'Test your knowledge across geography, STEM, history, and general topics. '
-        html += 'Click "Show Answer" to reveal the solution with explanation.'
-        html += '</p>'
+        # Quiz header with metadata and intro note
+        QUIZ_HEADER_TEMPLATE.render_into(
+            write,
+            ai_label='AI Generated • ' if metadata.get('generated_with_llm') else '',
+            count=len(questions),
+            difficulty=metadata.get('difficulty', 'medium').title()
+        )
         
         # Generate ALL questions with inline answers
         for i, question in enumerate(questions, 1):
-            html += '<div class="quiz-question">'
-            
-            # Question header with number and category
-            html += '<div class="quiz-question-header">'
-            html += f'<span class="quiz-question-number">{i}</span>'
-            html += f'<span class="quiz-category">{question.get("category", "General")}</span>'
-            html += '</div>'
-            
-            # Question text
-            html += f'<div class="quiz-question-text">{question.get("question", "Question not available")}</div>'
-            
-            # Options
-            html += '<div class="quiz-options">'
-            for option in question.get('options', []):
-                html += f'<div class="quiz-option">{option}</div>'
-            html += '</div>'
-            
-            # Reveal answer button
-            html += f'<button class="quiz-reveal-button" id="reveal-{i}" onclick="revealAnswer({i})">Show Answer</button>'
-            
-            # Hidden answer section
-            html += f'<div class="quiz-answer-section" id="answer-{i}">'
-            html += f'<div class="quiz-correct-answer">Answer: {question.get("correct_answer", "Not available")}</div>'
-            if question.get('explanation'):
-                html += f'<div class="quiz-explanation">{question["explanation"]}</div>'
-            html += '</div>'
-            
-            html += '</div>'  # quiz-question
-        
-        html += '</div>'  # quiz-box
-
-        return html
-
+            QUIZ_QUESTION_TEMPLATE.render_into(
+                write,
+                number=i,
+                category=question.get("category", "General"),
+                question=question.get("question", "Question not available"),
+                options=''.join(QUIZ_OPTION_TEMPLATE.render(option=option) for option in question.get('options', [])),
+                answer=question.get("correct_answer", "Not available"),
+                explanation=QUIZ_EXPLANATION_TEMPLATE.render(explanation=question['explanation'])
+                            if question.get('explanation') else ''
+            )
+        
+        write('</div>')  # quiz-box
+    
     def load_curated_data(self, json_path: str = 'data/loading/newsletter_curated.json') -> Dict:
         """Load curated newsletter data from JSON file"""
         with open(json_path, 'r', encoding='utf-8') as f:
@@ -126,57 +299,116 @@ class NewsletterGenerator:
     
     def generate_html(self, json_path: str = 'data/loading/newsletter_curated.json') -> str:
         """Generate complete HTML newsletter from JSON data"""
+        buffer = []
+        self.render_html(buffer.append, json_path)
+        return ''.join(buffer)
+    
+    def render_html(self, write: Callable[[str], object], json_path: str = 'data/loading/newsletter_curated.json'):
+        """Stream the complete HTML newsletter to `write` (list.append, or an open file's write)"""
         data = self.load_curated_data(json_path)
         quiz_data = self.load_quiz_data()
         date = self.get_nz_date()
-        
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Daily News Feed - {date}</title>
-    <style>
-        {self.get_css()}
-    </style>
-</head>
-<body>
-    <div class="container">
-        {self.generate_header(date)}
-        {self.generate_fx_box()}
-        {self.generate_market_box()}
-        {self.generate_content(data)}
-        {self.generate_quiz_section(quiz_data)}
-        {self.generate_footer()}
-    </div>
+        snapshot = DataSnapshot()
+        
+        if self.inline_assets:
+            styles = STYLE_INLINE_TEMPLATE.render(css=self.get_css())
+            scripts = SCRIPT_INLINE_TEMPLATE.render(js=self.get_js())
+        else:
+            styles = STYLE_LINK_TEMPLATE.render(href=asset_href(self.asset_files['css']))
+            scripts = SCRIPT_LINK_TEMPLATE.render(href=asset_href(self.asset_files['js']))
+        styles += HEADER_IMAGE_STYLE
+        
+        if self.fragment_cache is not None:
+            sections = self.render_cached_sections(date, snapshot, data, quiz_data)
+        else:
+            sections = dict(
+                header=self.generate_header(date),
+                fx_box=lambda w: self.render_fx_box(w, snapshot),
+                market_box=lambda w: self.render_market_box(w, snapshot),
+                content=lambda w: self.render_content(w, data),
+                quiz=lambda w: self.render_quiz_section(w, quiz_data)
+            )
+        
+        PAGE_TEMPLATE.render_into(
+            write,
+            date=date,
+            styles=styles,
+            scripts=scripts,
+            footer=self.generate_footer(),
+            **sections
+        )
     
-    <script>
-        function toggleCategory(categoryId) {{
-            const category = document.querySelector(`[data-category="${{categoryId}}"]`);
-            const icon = category.querySelector('.toggle-icon');
-            
-            if (category.classList.contains('collapsed')) {{
-                category.classList.remove('collapsed');
-                category.classList.add('expanded');
-                icon.textContent = '\u2212';
-            }} else {{
-                category.classList.remove('expanded');
-                category.classList.add('collapsed');
-                icon.textContent = '+';
-            }}
-        }}
+    def render_cached_sections(self, date: str, snapshot: DataSnapshot, data: Dict, quiz_data: Dict) -> Dict[str, str]:
+        """
+        Render each section through the fragment cache, keyed by that section's input data.
+        Timestamps are left out of the keys and spliced into the reused fragments instead.
+        """
+        cache = self.fragment_cache
+        fx_data, market_data = snapshot.fx, snapshot.market
+        fx_timestamp = fx_data.get('timestamp', 'Unknown')
+        market_timestamp = market_data.get('timestamp', 'Unknown')
+        
+        sections = {
+            'header': cache.render(
+                'header', date,
+                lambda w, holes: w(self.generate_header(date, holes['last_updated'])),
+                holes={'last_updated': self.get_last_updated()}
+            ),
+            'fx_box': cache.render(
+                'fx_box',
+                [{k: v for k, v in fx_data.items() if k != 'timestamp'}, snapshot.dxy],
+                lambda w, holes: self.render_fx_box(w, snapshot, holes['timestamp']),
+                holes={'timestamp': fx_timestamp}
+            ),
+            'market_box': cache.render(
+                'market_box',
+                {k: v for k, v in market_data.items() if k != 'timestamp'},
+                lambda w, holes: self.render_market_box(w, snapshot, holes['timestamp']),
+                holes={'timestamp': market_timestamp}
+            ),
+            'content': cache.render('content', data, lambda w, holes: self.render_content(w, data)),
+            'quiz': cache.render('quiz', quiz_data, lambda w, holes: self.render_quiz_section(w, quiz_data))
+        }
+        cache.save()
+        
+        print(f"Sections rebuilt: {', '.join(cache.rebuilt) or 'none'}; "
+              f"reused: {', '.join(cache.reused) or 'none'}")
+        return sections
+    
+    def get_js(self) -> str:
+        """Return the page's JavaScript (category toggles and quiz answers)"""
+        return NEWSLETTER_JS
+    
+    def publish_assets(self, page_paths: List[str]) -> Dict[str, str]:
+        """Write any missing CSS/JS files into the assets/build dir next to the saved pages"""
+        if self.inline_assets:
+            return {}
+        return publish_assets(page_paths, {
+            self.asset_files[kind]: content for kind, content in self.asset_contents.items()
+        })
+    
+    def prune_assets(self, page_paths: List[str]) -> Dict[str, str]:
+        """Remove CSS/JS builds that none of the pages next to the saved ones still use"""
+        if self.inline_assets:
+            return {}
+        return prune_assets(page_paths, self.asset_files.values())
+    
+    def write_outputs(self, html_content: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Publish the page to every path: minified (if enabled), written once durably to the
+        first path and hardlinked to the rest, with .gz/.br siblings and its assets.
+        Paths that already hold identical content are left untouched.
+        """
+        if self.minify:
+            html_content = minify_html(html_content)
         
-        function revealAnswer(questionId) {{
-            const answerDiv = document.getElementById(`answer-${{questionId}}`);
-            const button = document.getElementById(`reveal-${{questionId}}`);
-            
-            answerDiv.style.display = 'block';
-            button.style.display = 'none';
-        }}
-    </script>
-</body>
-</html>"""
-        return html
+        outcomes = self.publish_assets(paths)
+        outcomes.update(publish_text(html_content, paths))
+        outcomes.update(self.prune_assets(paths))
+        
+        page_outcomes = ', '.join(f"{path}: {outcomes[path]}" for path in paths)
+        print(f"Published newsletter ({page_outcomes})")
+        return outcomes
     
     def get_css(self) -> str:
         """Return CSS styles for the newsletter"""
@@ -202,7 +434,6 @@ class NewsletterGenerator:
         }
         
         .header {
-            background-image: url('assets/dunder_park.jpg');
             background-size: cover;
             background-position: center;
             background-repeat: no-repeat;
@@ -856,236 +1087,177 @@ class NewsletterGenerator:
         }
         """
     
-    def generate_fx_box(self) -> str:
+    def generate_fx_box(self, snapshot: Optional[DataSnapshot] = None) -> str:
         """Generate foreign exchange rates box with historical changes"""
+        buffer = []
+        self.render_fx_box(buffer.append, snapshot)
+        return ''.join(buffer)
+    
+    def render_fx_box(self, write: Callable[[str], object], snapshot: Optional[DataSnapshot] = None,
+                      timestamp: Optional[str] = None):
+        """Stream the FX box to `write`, or the unavailable notice if anything goes wrong"""
+        snapshot = snapshot or DataSnapshot()
+        # Rendered into a local buffer so a failure part-way never leaves half a box
+        buffer = []
         try:
-            fx_data = get_fx_changes_from_daily_data()
+            fx_data = snapshot.fx
             
             if fx_data.get('status') != 'success' or not fx_data.get('rates'):
-                return '<div class="fx-box"><p>Foreign exchange data currently unavailable</p></div>'
+                write(FX_UNAVAILABLE_HTML)
+                return
             
             rates_data = fx_data['rates']
-            timestamp = fx_data.get('timestamp', 'Unknown')
-            
-            html = '<div class="fx-box">'
-            html += '<div class="fx-header">'
-            html += '<h3 class="fx-title">Foreign Exchange Rates</h3>'
-            html += f'<div class="fx-timestamp">{timestamp}</div>'
-            html += '</div>'
-            
-            html += '<div class="fx-grid">'            
-            
-            # DXY row with real data
-            html += '<div class="fx-dxy-row">'            
             
             # Get DXY data
             try:
-                from foreign_exchange_data import get_dxy_from_market_data
-                dxy_data = get_dxy_from_market_data()
+                dxy_data = snapshot.dxy
                 dxy_current = dxy_data['current']
                 dxy_changes = dxy_data.get('changes', {})
             except Exception:
                 dxy_current = 0.00
                 dxy_changes = {}
             
-            html += '<div class="fx-rate">'            
-            html += '<div class="fx-pair">DXY (US Dollar Index)</div>'            
-            html += f'<div class="fx-value">{dxy_current}</div>'            
-            html += '<div class="fx-changes">'            
-            
-            # Add real percentage changes or defaults
-            for period in ['24h', '7d', '30d']:
-                if period in dxy_changes:
-                    change_pct = dxy_changes[period]
-                    if change_pct > 0.1:
-                        color_class = 'positive'
-                        sign = '+'
-                    elif change_pct < -0.1:
-                        color_class = 'negative'
-                        sign = ''
-                    else:
-                        color_class = 'neutral'
-                        sign = '+' if change_pct >= 0 else ''
-                    html += f'<span class="fx-change {color_class}">{period} {sign}{change_pct:.1f}%</span>'
-                else:
-                    html += f'<span class="fx-change neutral">{period} +0.0%</span>'
-            
-            html += '</div>'            
-            html += '</div>'            
-            html += '</div>'            
-            
-            # Currency pairs in rows of 3
-            html += '<div class="fx-currencies-grid">'
-            
-            # Define the order of currency pairs
-            pair_order = ['NZD/USD', 'NZD/AUD', 'NZD/INR', 'NZD/CNY', 'NZD/THB'] # , 'USD/BTC']
+            FX_BOX_OPEN_TEMPLATE.render_into(
+                buffer.append,
+                timestamp=timestamp or fx_data.get('timestamp', 'Unknown'),
+                dxy_value=dxy_current,
+                # Real percentage changes or defaults
+                dxy_changes=lambda w: self.render_changes(w, dxy_changes, FX_CHANGE_TEMPLATE, FX_CHANGE_MISSING_TEMPLATE)
+            )
             
-            for pair in pair_order:
+            # Currency pairs in the defined order
+            for pair in FX_PAIRS:
                 if pair in rates_data:
                     rate_info = rates_data[pair]
-                    current_rate = rate_info['current']
                     changes = rate_info.get('changes', {})
                     
-                    html += f'<div class="fx-rate">'
-                    html += f'<div class="fx-pair">{pair}</div>'
-                    html += f'<div class="fx-value">{current_rate}</div>'
-                    
-                    # Add percentage changes if available
-                    if changes:
-                        html += '<div class="fx-changes">'
-                        for period in ['24h', '7d', '30d']:
-                            if period in changes:
-                                change_pct = changes[period]
-                                
-                                # Determine color class
-                                if change_pct > 0.1:
-                                    color_class = 'positive'
-                                    sign = '+'
-                                elif change_pct < -0.1:
-                                    color_class = 'negative'
-                                    sign = ''
-                                else:
-                                    color_class = 'neutral'
-                                    sign = '+' if change_pct >= 0 else ''
-                                
-                                html += f'<span class="fx-change {color_class}">{period} {sign}{change_pct:.1f}%</span>'
-                        html += '</div>'
-                    
-                    html += f'</div>'
+                    FX_RATE_TEMPLATE.render_into(
+                        buffer.append,
+                        pair=pair,
+                        value=rate_info['current'],
+                        # Add percentage changes if available
+                        changes=(lambda w, changes=changes: FX_CHANGES_TEMPLATE.render_into(
+                            w, changes=lambda w2: self.render_changes(w2, changes, FX_CHANGE_TEMPLATE)
+                        )) if changes else ''
+                    )
             
-            html += '</div>'  # fx-currencies-grid
-            html += '</div>'  # fx-grid
-            html += '</div>'
-            
-            return html
+            buffer.append(FX_BOX_CLOSE_HTML)
             
         except Exception as e:
             print(f"Error generating FX box: {e}")
-            return '<div class="fx-box"><p>Foreign exchange data currently unavailable</p></div>'
+            write(FX_UNAVAILABLE_HTML)
+            return
+        
+        for piece in buffer:
+            write(piece)
+    
+    def render_changes(self, write: Callable[[str], object], changes: Dict, template: Template,
+                       missing_template: Optional[Template] = None):
+        """Write 24h/7d/30d change badges; periods without data use missing_template, or are skipped"""
+        for period in CHANGE_PERIODS:
+            if period in changes:
+                change_pct = changes[period]
+                
+                # Determine color class
+                if change_pct > 0.1:
+                    color_class = 'positive'
+                    sign = '+'
+                elif change_pct < -0.1:
+                    color_class = 'negative'
+                    sign = ''
+                else:
+                    color_class = 'neutral'
+                    sign = '+' if change_pct >= 0 else ''
+                
+                template.render_into(write, color_class=color_class, period=period, sign=sign, change=change_pct)
+            elif missing_template:
+                missing_template.render_into(write, period=period)
     
-    def generate_market_box(self) -> str:
+    def generate_market_box(self, snapshot: Optional[DataSnapshot] = None) -> str:
         """Generate market data box with collapsible categories and card layout"""
+        buffer = []
+        self.render_market_box(buffer.append, snapshot)
+        return ''.join(buffer)
+    
+    def render_market_box(self, write: Callable[[str], object], snapshot: Optional[DataSnapshot] = None,
+                          timestamp: Optional[str] = None):
+        """Stream the market box to `write`, or the unavailable notice if anything goes wrong"""
+        snapshot = snapshot or DataSnapshot()
+        # Rendered into a local buffer so a failure part-way never leaves half a box
+        buffer = []
         try:
-            market_data = get_market_changes_from_daily_data()
+            market_data = snapshot.market
             
             if market_data.get('status') != 'success' or not market_data.get('prices'):
-                return '<div class="market-box"><p>Market data currently unavailable</p></div>'
+                write(MARKET_UNAVAILABLE_HTML)
+                return
             
             prices_data = market_data['prices']
-            timestamp = market_data.get('timestamp', 'Unknown')
             
-            html = '<div class="market-box">'
-            html += '<div class="market-header">'
-            html += '<h3 class="market-title">Market Data</h3>'
-            html += f'<div class="market-timestamp">{timestamp}</div>'
-            html += '</div>'
+            MARKET_BOX_OPEN_TEMPLATE.render_into(buffer.append,
+                                                 timestamp=timestamp or market_data.get('timestamp', 'Unknown'))
             
             # Group instruments by category
-            categories = {
-                'US Indices': [],
-                'Currency Indices': [],
-                'International Indices': [],
-                'Commodities': [],
-                'ETFs': []
-            }
+            categories = {category_name: [] for category_name in MARKET_CATEGORY_IDS}
             
-            print(f"\nGrouping {len(prices_data)} instruments by category:")
+            logger.debug(f"Grouping {len(prices_data)} instruments by category")
             for ticker, data in prices_data.items():
                 category = data['category']
-                print(f"  {ticker}: {data['display_symbol']} -> {category}")
+                logger.debug(f"  {ticker}: {data['display_symbol']} -> {category}")
                 if category in categories:
                     categories[category].append((ticker, data))
                 else:
-                    print(f"  WARNING: Unknown category '{category}' for {ticker}")
+                    logger.warning(f"Unknown market category '{category}' for {ticker}")
             
-            print(f"\nCategory summary:")
-            for cat_name, instruments in categories.items():
-                print(f"  {cat_name}: {len(instruments)} instruments")
-            
-            # Category ID mapping for JavaScript
-            category_ids = {
-                'US Indices': 'us-indices',
-                'Currency Indices': 'currency-indices',
-                'International Indices': 'international',
-                'Commodities': 'commodities',
-                'ETFs': 'etfs'
-            }
+            if logger.isEnabledFor(logging.DEBUG):
+                for cat_name, instruments in categories.items():
+                    logger.debug(f"  {cat_name}: {len(instruments)} instruments")
             
             # Display each category with collapsible design
             for category_name, instruments in categories.items():
                 if instruments:  # Only show categories that have data
-                    category_id = category_ids.get(category_name, category_name.lower().replace(' ', '-'))
-                    count = len(instruments)
-                    
-                    html += f'<div class="market-category collapsed" data-category="{category_id}">'
-                    html += f'<div class="market-category-header" onclick="toggleCategory(\'{category_id}\')">' 
-                    html += f'<div class="market-category-title">'
-                    html += f'<span class="toggle-icon">+</span>'
-                    html += f'{category_name}'
-                    html += f'<span class="category-count">({count})</span>'
-                    html += f'</div>'
-                    html += f'</div>'
-                    
-                    html += f'<div class="market-instruments">'
-                    html += f'<div class="market-instruments-grid">'
+                    MARKET_CATEGORY_OPEN_TEMPLATE.render_into(
+                        buffer.append,
+                        category_id=MARKET_CATEGORY_IDS.get(category_name, category_name.lower().replace(' ', '-')),
+                        category_name=category_name,
+                        count=len(instruments)
+                    )
                     
                     for ticker, data in instruments:
-                        current_price = data['current']
-                        display_symbol = data['display_symbol']
-                        currency = data['currency']
-                        changes = data.get('changes', {})
-                        
-                        # Format price: remove decimals, add commas
-                        formatted_price = f"{int(current_price):,}"
-                        
-                        html += f'<div class="market-instrument-card">'
-                        html += f'<div class="market-symbol">{display_symbol}</div>'
-                        html += f'<div class="market-price">{formatted_price} {currency}</div>'
-                        html += f'<div class="market-changes">'
-                        
-                        # Add individual change periods (24h, 7d, 30d)
-                        for period in ['24h', '7d', '30d']:
-                            if period in changes:
-                                change_pct = changes[period]
-                                
-                                # Determine color class
-                                if change_pct > 0.1:
-                                    color_class = 'positive'
-                                    sign = '+'
-                                elif change_pct < -0.1:
-                                    color_class = 'negative'
-                                    sign = ''
-                                else:
-                                    color_class = 'neutral'
-                                    sign = '+' if change_pct >= 0 else ''
-                                
-                                html += f'<div class="market-change {color_class}">{period} {sign}{change_pct:.1f}%</div>'
-                            else:
-                                html += f'<div class="market-change neutral">{period} -</div>'
-                        
-                        html += f'</div>'  # market-changes
-                        html += f'</div>'  # market-instrument-card
+                        MARKET_INSTRUMENT_TEMPLATE.render_into(
+                            buffer.append,
+                            symbol=data['display_symbol'],
+                            # Format price: remove decimals, add commas
+                            price=int(data['current']),
+                            currency=data['currency'],
+                            # Individual change periods (24h, 7d, 30d)
+                            changes=lambda w, changes=data.get('changes', {}): self.render_changes(
+                                w, changes, MARKET_CHANGE_TEMPLATE, MARKET_CHANGE_MISSING_TEMPLATE
+                            )
+                        )
                     
-                    html += f'</div>'  # market-instruments-grid
-                    html += f'</div>'  # market-instruments
-                    html += f'</div>'  # market-category
+                    buffer.append(MARKET_CATEGORY_CLOSE_HTML)
             
-            html += '</div>'  # market-box
-            
-            return html
+            buffer.append('</div>')  # market-box
             
         except Exception as e:
             print(f"Error generating market box: {e}")
-            return '<div class="market-box"><p>Market data currently unavailable</p></div>'
+            write(MARKET_UNAVAILABLE_HTML)
+            return
+        
+        for piece in buffer:
+            write(piece)
     
-    def generate_header(self, date: str) -> str:
+    def get_last_updated(self) -> str:
+        """Current NZT time as shown in the header's last updated line"""
+        return datetime.now(NZ_TZ).strftime('%d %b %Y, %-I:%M %p %Z')
+    
+    def generate_header(self, date: str, last_updated: Optional[str] = None) -> str:
         """Generate newsletter header"""
         formatted_date = datetime.strptime(date, '%Y-%m-%d').strftime('%B %d, %Y')
         
         # Get current NZT time for last updated
-        nz_tz = pytz.timezone('Pacific/Auckland')
-        current_nz_time = datetime.now(nz_tz)
-        last_updated = current_nz_time.strftime('%d %b %Y, %-I:%M %p %Z')
+        last_updated = last_updated or self.get_last_updated()
         
         return f"""
         <div class="header">
@@ -1097,6 +1269,12 @@ class NewsletterGenerator:
     
     def generate_content(self, data: Dict) -> str:
         """Generate priority-based newsletter content"""
+        buffer = []
+        self.render_content(buffer.append, data)
+        return ''.join(buffer)
+    
+    def render_content(self, write: Callable[[str], object], data: Dict):
+        """Stream priority-based newsletter content to `write`"""
         # Collect ALL stories with importance scores
         all_top_stories = []
         all_quick_reads = []
@@ -1112,74 +1290,66 @@ class NewsletterGenerator:
         category_priority = {'tech': 1, 'world': 2, 'finance': 3, 'nz': 4}
         all_quick_reads.sort(key=lambda x: category_priority.get(x.get('category_label', ''), 5))
         
-        content = '<div class="content">'
+        write('<div class="content">')
         
         # All articles in priority order without section titles
-        for story in all_top_stories:
-            content += self.generate_mixed_article_html(story, tier="critical" if story in all_top_stories[:5] else "key")
+        for i, story in enumerate(all_top_stories):
+            self.render_article(write, story, tier="critical" if i < 5 else "key")
         
         for read in all_quick_reads:
-            content += self.generate_mixed_article_html(read, tier="monitoring")
+            self.render_article(write, read, tier="monitoring")
         
-        content += '</div>'
-        return content
+        write('</div>')
     
     def generate_mixed_article_html(self, article: Dict, tier: str) -> str:
         """Generate HTML for articles in the new priority-based layout"""
-        tier_styles = {
-            "critical": "article critical",
-            "key": "article key", 
-            "monitoring": "article monitoring"
-        }
-        
-        css_class = tier_styles.get(tier, "article")
-        
+        buffer = []
+        self.render_article(buffer.append, article, tier)
+        return ''.join(buffer)
+    
+    def render_article(self, write: Callable[[str], object], article: Dict, tier: str):
+        """Stream one article in the priority-based layout to `write`"""
         # Format published date - convert to NZT
         try:
             if isinstance(article.get('published'), str):
                 # Parse the UTC datetime
                 pub_date = datetime.fromisoformat(article['published'].replace('Z', '+00:00'))
                 
-                # Convert to New Zealand timezone
-                nz_tz = pytz.timezone('Pacific/Auckland')
-                nz_date = pub_date.astimezone(nz_tz)
-                
-                # Format as full datetime with timezone
-                formatted_date = nz_date.strftime('%d %b %Y, %-I:%M %p %Z')
+                # Convert to New Zealand timezone, formatted as full datetime with timezone
+                formatted_date = pub_date.astimezone(NZ_TZ).strftime('%d %b %Y, %-I:%M %p %Z')
             else:
                 formatted_date = "Recent"
         except Exception as e:
             formatted_date = "Recent"
         
-        html = f'<div class="{css_class}">'
-        
-        # Category badge + title
-        html += f'<div class="article-header">'
-        html += f'<span class="category-badge {article.get("category_label", "")}">{article.get("category_display", "")}</span>'
-        html += f'<div class="article-title"><a href="{article.get("url", "#")}" target="_blank">{article.get("title", "No Title")}</a></div>'
-        html += f'</div>'
-        
-        # Meta info
-        html += f'<div class="article-meta">{article.get("source", "Unknown")} • {formatted_date}'
-        if tier != "monitoring" and article.get('importance_score'):
-            html += f' • Priority: {article["importance_score"]}/10'
-        html += f'</div>'
+        # Category badge + title, then meta info
+        ARTICLE_OPEN_TEMPLATE.render_into(
+            write,
+            css_class=ARTICLE_TIER_CLASSES.get(tier, "article"),
+            category_label=article.get("category_label", ""),
+            category_display=article.get("category_display", ""),
+            url=article.get("url", "#"),
+            title=article.get("title", "No Title"),
+            source=article.get("source", "Unknown"),
+            published=formatted_date,
+            priority=f' • Priority: {article["importance_score"]}/10'
+                     if tier != "monitoring" and article.get('importance_score') else ''
+        )
         
         # Content based on tier and available summaries
         if tier == "critical" or tier == "key":
             if article.get('enhanced_summary'):
-                html += f'<div class="article-summary">{article["enhanced_summary"]}</div>'
+                ARTICLE_SUMMARY_TEMPLATE.render_into(write, summary=article["enhanced_summary"])
                 if article.get('why_matters'):
-                    html += f'<div class="why-matters"><strong>Why this matters:</strong> {article["why_matters"]}</div>'
+                    ARTICLE_WHY_MATTERS_TEMPLATE.render_into(write, why_matters=article["why_matters"])
             elif article.get('llm_summary'):
-                html += f'<div class="article-summary">{article["llm_summary"]}</div>'
+                ARTICLE_SUMMARY_TEMPLATE.render_into(write, summary=article["llm_summary"])
             elif article.get('description'):
-                html += f'<div class="article-summary">{article["description"]}</div>'
+                ARTICLE_SUMMARY_TEMPLATE.render_into(write, summary=article["description"])
         elif tier == "monitoring" and article.get('llm_reason'):
-            html += f'<div class="article-reason">{article["llm_reason"]}</div>'
+            ARTICLE_REASON_TEMPLATE.render_into(write, reason=article["llm_reason"])
         
-        html += '</div>'
-        return html
+        write('</div>')
     
     
     def generate_footer(self) -> str:
@@ -1207,14 +1377,7 @@ class NewsletterGenerator:
         
         html_content = self.generate_html(json_path)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        with open("newsletter.html", 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        with open("docs/index.html", 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        self.write_outputs(html_content, [output_path, "newsletter.html", "docs/index.html"])
         
         return output_path
     
@@ -1226,8 +1389,11 @@ def regenerate_newsletter_with_nzt(
     Regenerate newsletter HTML from existing JSON with NZT formatting.
     No ETL - just processes saved data with updated time display.
     """
-    # Initialize generator
-    generator = NewsletterGenerator()
+    # Initialize generator - sections whose inputs haven't changed since the last
+    # build are reused from the fragment cache
+    generator = NewsletterGenerator(
+        fragment_cache=FragmentCache(version=source_fingerprint(__file__, templates.__file__))
+    )
     
     # Generate with updated formatting (your new NZT code)
     html_content = generator.generate_html(json_path)
@@ -1238,14 +1404,7 @@ def regenerate_newsletter_with_nzt(
         output_path = f"archive/newsletter_{date}_nzt.html"
     
     # Write to all the usual places
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open("newsletter.html", 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open("docs/index.html", 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    generator.write_outputs(html_content, [output_path, "newsletter.html", "docs/index.html"])
     
     print(f"Newsletter regenerated with NZT formatting: {output_path}")
     return output_path
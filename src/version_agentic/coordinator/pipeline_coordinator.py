@@ -10,45 +10,34 @@ import json
 import logging
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 sys.path.append(os.getcwd())
 
-class PipelineState:
-    """Pipeline state management with minimal logging"""
-    def __init__(self):
-        self.data = {}
-        self.start_time = datetime.now()
-        self.stage_results = {}
-    
-    def set_stage_result(self, stage_name: str, result: Any):
-        """Store result from a pipeline stage"""
-        self.stage_results[stage_name] = result
-    
-    def get_stage_result(self, stage_name: str) -> Any:
-        """Get result from previous stage"""
-        return self.stage_results.get(stage_name)
-    
-    def save_json_output(self, newsletter_data: Dict, file_path: str = 'data/loading/newsletter_curated.json'):
-        """Save newsletter data to JSON - exactly like MVP"""
-        with open(file_path, 'w') as f:
-            json.dump(newsletter_data, f, indent=2)
+from src.mvp_news_aggregator.tracing import span, start_trace, stop_trace
+from .stage_executor import Stage, StageExecutor
+from .state_manager import PipelineState
 
 class PipelineCoordinator:
     """
     Pipeline orchestrator that replicates MVP functionality exactly
     
     Calls the same MVP classes (ArticleCollector, ArticleCurator, generate_newsletter)
-    with improved structure and proper logging
+    with improved structure and proper logging. Stages run as a dependency graph:
+    collection -> curation, quiz, FX and market pulls run concurrently and join at
+    HTML generation.
     """
     
-    def __init__(self, use_llm: bool = True):
+    def __init__(self, use_llm: bool = True, max_parallel_stages: int = 4, resume: bool = False,
+                 trace: bool = True):
         self.use_llm = use_llm
-        self.state = PipelineState()
+        self.max_parallel_stages = max_parallel_stages
+        self.trace = trace
+        self.state = PipelineState(resume=resume)
         self.logger = self._setup_logging()
         
-        self.logger.info(f"Pipeline coordinator initialized (LLM enabled: {use_llm})")
+        self.logger.info(f"Pipeline coordinator initialized (LLM enabled: {use_llm}, resume: {resume})")
     
     def _setup_logging(self):
         """Configure structured logging"""
@@ -75,34 +64,50 @@ class PipelineCoordinator:
         pipeline_start = datetime.now()
         self.logger.info("Pipeline execution started")
         
+        executor = StageExecutor(self._build_stages(), max_workers=self.max_parallel_stages,
+                                 logger=self.logger, state=self.state)
+        if self.trace:
+            start_trace()
         try:
-            # Stage 1: Collection
-            results = await self._run_collection_stage()
-            self.state.set_stage_result('collection', results)
-            
-            # Stage 2: Curation  
-            newsletter_data = await self._run_curation_stage(results)
-            self.state.set_stage_result('curation', newsletter_data)
-            
-            # Stage 3: JSON persistence
-            self.state.save_json_output(newsletter_data)
-            self.state.set_stage_result('json_save', True)
-            
-            # Stage 4: HTML generation
-            html_result = await self._run_generation_stage()
-            self.state.set_stage_result('generation', html_result)
+            with span('run_pipeline', 'pipeline', use_llm=self.use_llm, resume=self.state.resume):
+                results = await executor.run()
             
             duration = (datetime.now() - pipeline_start).total_seconds()
+            if executor.resumed:
+                self.logger.info(f"Resumed from checkpoints: {', '.join(executor.resumed)}")
             self.logger.info(f"Pipeline completed successfully in {duration:.1f}s")
             
-            return newsletter_data
+            return results['curation']
             
         except Exception as e:
             duration = (datetime.now() - pipeline_start).total_seconds()
             self.logger.error(f"Pipeline failed after {duration:.1f}s: {str(e)}")
             raise
+        finally:
+            # Keep whatever completed, including on failure
+            for stage_name, result in executor.results.items():
+                self.state.set_stage_result(stage_name, result)
+            if self.trace:
+                self.logger.info(f"Trace written to {stop_trace()}")
+    
+    def _build_stages(self) -> List[Stage]:
+        """Pipeline stage graph - each stage lists the stages whose results it needs"""
+        # Source stages have no upstream inputs; keying them by run date means a resume
+        # reuses today's pulls but never yesterday's
+        run_params = {'date': datetime.now().strftime('%Y-%m-%d'), 'use_llm': self.use_llm}
+        return [
+            Stage('collection', self._run_collection_stage, params=run_params),
+            Stage('curation', self._run_curation_stage, depends_on=['collection'], params=run_params),
+            # Always rewrite the JSON generation reads, even when curation was resumed
+            Stage('json_save', self._run_json_save_stage, depends_on=['curation'], checkpoint=False),
+            Stage('quiz', self._run_quiz_stage, params=run_params),
+            Stage('fx', self._run_fx_stage, params=run_params),
+            Stage('market', self._run_market_stage, params=run_params),
+            # Generation reads everything back from data/loading, so it waits for all of it
+            Stage('generation', self._run_generation_stage, depends_on=['json_save', 'quiz', 'fx', 'market']),
+        ]
     
-    async def _run_collection_stage(self) -> Dict:
+    def _run_collection_stage(self) -> Dict:
         """
         Article collection - exact replica of MVP collection logic
         """
@@ -123,7 +128,7 @@ class PipelineCoordinator:
         
         return results
     
-    async def _run_curation_stage(self, results: Dict) -> Dict:
+    def _run_curation_stage(self, results: Dict) -> Dict:
         """
         Article curation - exact replica of MVP curation logic
         """
@@ -151,7 +156,50 @@ class PipelineCoordinator:
         
         return newsletter_data
     
-    async def _run_generation_stage(self) -> str:
+    def _run_json_save_stage(self, newsletter_data: Dict) -> bool:
+        """
+        JSON persistence - exact replica of MVP save
+        """
+        self.state.save_json_output(newsletter_data)
+        return True
+    
+    def _run_quiz_stage(self) -> Dict:
+        """
+        Quiz generation - exact replica of MVP quiz pull
+        """
+        self.logger.debug("Starting quiz generation")
+        
+        from src.mvp_news_aggregator.quiz_data import pull_quiz_data
+        
+        quiz_data = pull_quiz_data(use_llm=self.use_llm)
+        self.logger.info(f"Quiz data status: {quiz_data.get('status')}")
+        return quiz_data
+    
+    def _run_fx_stage(self) -> Dict:
+        """
+        Foreign exchange pull - exact replica of MVP FX pull
+        """
+        self.logger.debug("Starting FX data pull")
+        
+        from src.mvp_news_aggregator.foreign_exchange_data import pull_fx_data
+        
+        fx_data = pull_fx_data()
+        self.logger.info(f"FX data status: {fx_data.get('status')}")
+        return fx_data
+    
+    def _run_market_stage(self) -> Dict:
+        """
+        Market data pull - exact replica of MVP market pull
+        """
+        self.logger.debug("Starting market data pull")
+        
+        from src.mvp_news_aggregator.market_data import pull_market_data
+        
+        market_data = pull_market_data()
+        self.logger.info(f"Market data status: {market_data.get('status')}")
+        return market_data
+    
+    def _run_generation_stage(self, *upstream) -> str:
         """
         HTML generation - exact replica of MVP generation logic  
         """
@@ -167,16 +215,17 @@ class PipelineCoordinator:
         return html
 
 
-def run_agentic_pipeline(use_llm: bool = True) -> Dict[str, Any]:
+def run_agentic_pipeline(use_llm: bool = True, resume: bool = False) -> Dict[str, Any]:
     """
     Main pipeline entry point - exact replica of run_daily_pipeline()
     
     Args:
         use_llm: Enable/disable LLM processing (same as MVP)
+        resume: Skip stages whose inputs match their last checkpoint
     
     Returns:
         newsletter_data: Same format as MVP output
     """
-    coordinator = PipelineCoordinator(use_llm=use_llm)
+    coordinator = PipelineCoordinator(use_llm=use_llm, resume=resume)
     return asyncio.run(coordinator.run_pipeline())
 
@@ -0,0 +1,169 @@
+"""
+Stage DAG executor - runs pipeline stages concurrently as their dependencies complete
+"""
+
+# src/version_agentic/coordinator/stage_executor.py
+
+import time
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.mvp_news_aggregator.tracing import in_current_span, span
+from .state_manager import PipelineState, stage_input_hash
+
+
+def is_error_result(result: Any) -> bool:
+    """Whether a stage reported failure in its result (the MVP data pulls return errors rather than raise)"""
+    return isinstance(result, dict) and (result.get('status') == 'error' or 'error' in result)
+
+
+class Stage:
+    """
+    A pipeline stage and the stages it depends on
+
+    `func` is called with the results of `depends_on`, in order. Plain functions are
+    treated as blocking and run in a worker thread; coroutine functions are awaited
+    on the event loop. `params` is anything else the result depends on (run date,
+    settings) and goes into the stage's checkpoint key with those results. Stages that
+    are cheap and exist for their side effects can opt out with checkpoint=False.
+    """
+    def __init__(self, name: str, func: Callable, depends_on: Sequence[str] = (), params: Any = None,
+                 checkpoint: bool = True):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.params = params
+        self.checkpoint = checkpoint
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, depends_on={list(self.depends_on)})"
+
+
+class StageExecutor:
+    """
+    Executes a DAG of stages with independent branches running concurrently
+
+    Each stage starts as soon as all of its dependencies have finished, so end-to-end
+    wall time is the critical path rather than the sum of all stages. If a stage fails,
+    stages that haven't started yet are cancelled and the error is raised.
+
+    Given a PipelineState, every successful result is checkpointed; when the state is
+    resuming, stages whose inputs match their last checkpoint are reloaded instead of run.
+    Error results are never checkpointed, so a transient failure is retried on resume.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4, logger: Optional[logging.Logger] = None,
+                 state: Optional[PipelineState] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = self._topological_order(stages)
+        self.max_workers = max_workers
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = state
+        self.results = {}
+        self.timings = {}
+        self.resumed = []
+
+    @staticmethod
+    def _topological_order(stages: List[Stage]) -> List[str]:
+        """Stage names with every stage after its dependencies; rejects unknown deps and cycles"""
+        names = {stage.name for stage in stages}
+        if len(names) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+
+        remaining = {stage.name: set(stage.depends_on) for stage in stages}
+        for name, deps in remaining.items():
+            unknown = deps - names
+            if unknown:
+                raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(sorted(unknown))}")
+
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage and return {stage name: result}"""
+        loop = asyncio.get_running_loop()
+        tasks = {}
+
+        async def run_stage(stage: Stage):
+            args = [await tasks[dep] for dep in stage.depends_on]
+
+            started = time.perf_counter()
+            input_hash = None
+            if self.state is not None and stage.checkpoint:
+                input_hash = stage_input_hash(stage.name, stage.params, args)
+                if self.state.resume:
+                    found, result = self.state.load_checkpoint(stage.name, input_hash)
+                    if found and not is_error_result(result):
+                        self.timings[stage.name] = (started, time.perf_counter())
+                        self.results[stage.name] = result
+                        self.resumed.append(stage.name)
+                        self.logger.info(f"Stage '{stage.name}' inputs unchanged - reloaded from checkpoint")
+                        return result
+
+            self.logger.debug(f"Stage '{stage.name}' started")
+            if asyncio.iscoroutinefunction(stage.func):
+                with span(stage.name, 'stage'):
+                    result = await stage.func(*args)
+            else:
+                @in_current_span
+                def run_traced(*args):
+                    with span(stage.name, 'stage'):
+                        return stage.func(*args)
+                result = await loop.run_in_executor(executor, functools.partial(run_traced, *args))
+
+            self.timings[stage.name] = (started, time.perf_counter())
+            self.results[stage.name] = result
+            self.logger.info(f"Stage '{stage.name}' finished in {time.perf_counter() - started:.1f}s")
+            if input_hash is not None and is_error_result(result):
+                self.logger.info(f"Stage '{stage.name}' reported an error - not checkpointing it")
+            elif input_hash is not None:
+                self.state.save_checkpoint(stage.name, input_hash, result)
+            return result
+
+        run_start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage')
+        try:
+            for name in self.order:
+                tasks[name] = asyncio.ensure_future(run_stage(self.stages[name]))
+
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            failed = [task for task in done if not task.cancelled() and task.exception()]
+            if failed:
+                # Stages already running in a thread can't be interrupted, but nothing new starts
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise failed[0].exception()
+        finally:
+            executor.shutdown(wait=False)
+
+        self._log_summary(time.perf_counter() - run_start)
+        return dict(self.results)
+
+    def critical_path(self) -> List[str]:
+        """The chain of dependent stages with the longest total duration"""
+        longest = {}
+        for name in self.order:
+            duration = self.timings[name][1] - self.timings[name][0]
+            best = max((longest[dep] for dep in self.stages[name].depends_on), key=lambda item: item[0], default=(0.0, []))
+            longest[name] = (best[0] + duration, best[1] + [name])
+        return max(longest.values(), key=lambda item: item[0], default=(0.0, []))[1]
+
+    def _log_summary(self, wall_time: float):
+        total = sum(end - start for start, end in self.timings.values())
+        path = self.critical_path()
+        path_time = sum(self.timings[name][1] - self.timings[name][0] for name in path)
+        self.logger.info(f"Stages took {total:.1f}s in total, {wall_time:.1f}s wall time "
+                         f"(critical path {' -> '.join(path)}: {path_time:.1f}s)")
@@ -2,5 +2,87 @@
 Pipeline state management
 """
 
-# TODO: Implement PipelineState class
-pass
+# src/version_agentic/coordinator/state_manager.py
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Local storage - latest checkpoint of each stage
+CHECKPOINT_DIR = 'data/cache/checkpoints'
+
+logger = logging.getLogger('NewsletterPipeline')
+
+
+def stage_input_hash(stage_name: str, params: Any, inputs: Any) -> str:
+    """SHA-256 of a stage's name, parameters and input data (dict key order doesn't matter)"""
+    payload = json.dumps([stage_name, params, inputs], sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PipelineState:
+    """
+    Pipeline state with stage checkpoints persisted to disk
+
+    Every completed stage's result is saved under the stage name together with a hash
+    of its inputs. With resume enabled, a stage whose inputs hash the same as its last
+    checkpoint is skipped and its result reloaded, so retrying after a late failure
+    doesn't re-collect articles or re-pay LLM calls.
+    """
+    def __init__(self, checkpoint_dir: str = CHECKPOINT_DIR, resume: bool = False):
+        self.data = {}
+        self.start_time = datetime.now()
+        self.stage_results = {}
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+
+    def set_stage_result(self, stage_name: str, result: Any):
+        """Store result from a pipeline stage"""
+        self.stage_results[stage_name] = result
+
+    def get_stage_result(self, stage_name: str) -> Any:
+        """Get result from previous stage"""
+        return self.stage_results.get(stage_name)
+
+    def _checkpoint_path(self, stage_name: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{stage_name}.json")
+
+    def load_checkpoint(self, stage_name: str, input_hash: str) -> Tuple[bool, Optional[Any]]:
+        """(True, result) if the stage's last checkpoint was made from the same inputs"""
+        try:
+            with open(self._checkpoint_path(stage_name), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        if checkpoint.get('input_hash') != input_hash:
+            return False, None
+        return True, checkpoint.get('result')
+
+    def save_checkpoint(self, stage_name: str, input_hash: str, result: Any):
+        """Persist a stage result atomically, replacing that stage's previous checkpoint"""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self._checkpoint_path(stage_name)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'stage': stage_name,
+                    'input_hash': input_hash,
+                    'saved_at': datetime.now().isoformat(),
+                    'result': result
+                }, f, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # A missing checkpoint only costs a re-run on resume, never fail the stage over it
+            logger.warning(f"Could not checkpoint stage '{stage_name}': {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save_json_output(self, newsletter_data: Dict, file_path: str = 'data/loading/newsletter_curated.json'):
+        """Save newsletter data to JSON - exactly like MVP"""
+        with open(file_path, 'w') as f:
+            json.dump(newsletter_data, f, indent=2)
@@ -13,6 +13,7 @@ Exact replica of MVP functionality with improved architecture
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
 # Add parent directory to path for MVP imports
@@ -25,13 +26,17 @@ from coordinator.pipeline_coordinator import run_agentic_pipeline
 
 def main():
     """Main execution - matches MVP main.py behavior exactly"""
+    parser = argparse.ArgumentParser(description="Agentic newsletter pipeline")
+    parser.add_argument('--resume', action='store_true',
+                        help="reuse checkpointed results of stages whose inputs are unchanged")
+    args = parser.parse_args()
     
     # Configuration
     RUN_ETL = True
     USE_LLM = False
     
     if RUN_ETL:
-        newsletter_data = run_agentic_pipeline(use_llm=USE_LLM)
+        newsletter_data = run_agentic_pipeline(use_llm=USE_LLM, resume=args.resume)
         return newsletter_data
     else:
         # Fallback to HTML regeneration only - same as MVP  